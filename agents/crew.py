@@ -2,15 +2,35 @@
 Multi-Agent System using CrewAI
 Coordinates Receptionist and Clinical Nephrology Agents
 """
+import asyncio
+import contextvars
+import functools
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Iterator, Optional
 from crewai import Agent, Task, Crew, Process
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.tools import Tool
 from dotenv import load_dotenv
 import logging
 
-from tools.patient_tool import get_patient_report, search_patient_by_id
+from tools.patient_store import get_patient_repository
+from tools.patient_tool import (
+    DEFAULT_REPORT_HEADING,
+    find_patient_in_message,
+    format_patient_report,
+    get_patient_report,
+    search_patient_by_id,
+)
 from tools.web_search_tool import web_search
+from agents.memory import ConversationMemory, ConversationMemoryStore, active_memory
+from agents.response_cache import create_response_cache, involves_patient_data
+from agents.crew_pool import CrewPool
+from agents.router import IntentRouter
+from agents.streaming import stream_crew, stream_remainder
+from rag.context import ContextAssembler
 
 
 load_dotenv()
@@ -22,6 +42,67 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Threads for blocking work of aprocess_message, shared by all in-flight conversations
+CREW_ASYNC_WORKERS = int(os.getenv("CREW_ASYNC_WORKERS", "64"))
+
+# Speculative mode: run a web search alongside RAG retrieval for every clinical question
+CLINICAL_PREFETCH_WEB = os.getenv("CLINICAL_PREFETCH_WEB", "False").lower() == "true"
+
+# Seconds to wait for the prefetched web search once retrieval is done
+PREFETCH_WEB_TIMEOUT = float(os.getenv("PREFETCH_WEB_TIMEOUT", "10"))
+
+# Shown in place of the discharge summary until a patient is identified
+NO_PATIENT = "No patient identified yet."
+
+PINNED_PATIENT_HEADING = "Discharge summary (already retrieved for this conversation)"
+
+# Task templates; {placeholders} are filled per message by Crew.kickoff(inputs=...)
+RECEPTIONIST_TASK_TEMPLATE = """
+            Conversation so far:
+            {history}
+            
+            Identified patient:
+            {patient}
+            
+            User message: {message}
+            
+            Your task:
+            1. If this is a greeting, respond warmly and ask for the patient's name
+               (unless the patient is already identified above)
+            2. If the user provides their name, retrieve their discharge summary; if it is
+               already shown above, use it instead of calling PatientReportRetrieval or PatientIDLookup.
+               If no exact match is found, ask the patient to confirm their full registered name or
+               their patient ID; never pick a similar name for them
+            3. If the user asks a medical question, acknowledge and explain that you're
+               connecting them with a clinical specialist
+            4. Be friendly, professional, and helpful
+            
+            Provide a clear, concise response.
+            """
+
+CLINICAL_TASK_TEMPLATE = """
+            Conversation so far:
+            {history}
+            
+            Patient's discharge summary:
+            {patient}
+            
+            Patient question: {message}
+            
+            Relevant medical knowledge:
+            {context}
+            
+            Your task:
+            1. Answer the patient's question accurately using the provided medical knowledge
+               and, where relevant, their discharge summary
+            2. If you need more current information, use the web search tool
+            3. Provide clear, evidence-based guidance
+            4. Include appropriate warnings signs if relevant
+            5. Always end with a medical disclaimer reminding them to consult their healthcare provider
+            
+            Provide a comprehensive but clear response.
+            """
+
 
 class MedicalAICrew:
     """Medical AI Multi-Agent System"""
@@ -33,8 +114,20 @@ class MedicalAICrew:
         Args:
             rag_retriever: Optional RAG retriever for clinical knowledge
         """
-        self.rag_retriever = rag_retriever
+        self.attach_knowledge_base(rag_retriever)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        
+        # Per-session history, identified patient and retrieved context
+        self.memory = ConversationMemoryStore()
         
+        # Deduplicates retrieved chunks and fits them to the prompt token budget
+        self.context_assembler = ContextAssembler()
+        
+        self.prefetch_web = CLINICAL_PREFETCH_WEB
+        self._prefetch_executor = None
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_stats = {"requests": 0, "web_timeouts": 0, "saved_ms": 0.0}
         
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key or api_key == "your-google-api-key-here":
@@ -49,7 +142,7 @@ class MedicalAICrew:
     
         self.patient_tool = Tool(
             name="PatientReportRetrieval",
-            func=get_patient_report,
+            func=self._lookup_patient_report,
             description="""
             Use this tool to retrieve a patient's discharge summary by their full name.
             Input should be the patient's full name (e.g., 'John Smith').
@@ -59,7 +152,7 @@ class MedicalAICrew:
         
         self.patient_id_tool = Tool(
             name="PatientIDLookup",
-            func=search_patient_by_id,
+            func=self._lookup_patient_id,
             description="""
             Use this tool to retrieve a patient's information by their patient ID.
             Input should be the patient ID (e.g., 'P001').
@@ -81,8 +174,48 @@ class MedicalAICrew:
         self.receptionist_agent = self._create_receptionist_agent()
         self.clinical_agent = self._create_clinical_agent()
         
+        # Crews are built once and reused; each message only supplies inputs
+        self.receptionist_pool = CrewPool(self._build_receptionist_crew)
+        self.receptionist_pool.add(self._build_receptionist_crew(self.receptionist_agent))
+        self.clinical_pool = CrewPool(self._build_clinical_crew)
+        self.clinical_pool.add(self._build_clinical_crew(self.clinical_agent))
+        
         logger.info("Medical AI Crew initialized successfully")
     
+    def attach_knowledge_base(self, rag_retriever):
+        """
+        Use a knowledge base, e.g. one loaded in parallel with the agents.
+        
+        Args:
+            rag_retriever: RAG retriever for clinical knowledge (None detaches it)
+        """
+        self.rag_retriever = rag_retriever
+        self.response_cache = create_response_cache(rag_retriever)
+        
+        # Keyword routing, with the knowledge base's embedding model for undecided messages
+        rag = getattr(rag_retriever, "rag", None)
+        self.router = IntentRouter(embeddings=rag.embeddings if rag is not None else None)
+    
+    def _lookup_patient_report(self, patient_name: str) -> str:
+        """PatientReportRetrieval tool; an exact match is remembered for the conversation"""
+        report = get_patient_report(patient_name)
+        memory = active_memory.get()
+        if memory is not None and report.lstrip().startswith(DEFAULT_REPORT_HEADING):
+            matches = get_patient_repository().find_by_name(patient_name)
+            if len(matches) == 1:
+                memory.remember_patient(matches[0])
+        return report
+    
+    def _lookup_patient_id(self, patient_id: str) -> str:
+        """PatientIDLookup tool; the patient found is remembered for the conversation"""
+        result = search_patient_by_id(patient_id)
+        memory = active_memory.get()
+        if memory is not None and not result.startswith("❌"):
+            patient = get_patient_repository().find_by_id(patient_id)
+            if patient is not None:
+                memory.remember_patient(patient)
+        return result
+    
     def _create_receptionist_agent(self) -> Agent:
         """Create the Receptionist Agent"""
         return Agent(
@@ -102,7 +235,8 @@ class MedicalAICrew:
             tools=[self.patient_tool, self.patient_id_tool],
             llm=self.llm,
             verbose=True,
-            allow_delegation=True
+            allow_delegation=True,
+            cache=False
         )
     
     def _create_clinical_agent(self) -> Agent:
@@ -125,125 +259,495 @@ class MedicalAICrew:
             tools=[self.web_search_tool],
             llm=self.llm,
             verbose=True,
-            allow_delegation=False
+            allow_delegation=False,
+            cache=False
         )
     
-    def process_message(self, user_message: str, conversation_history: list = None) -> str:
+    def _build_receptionist_crew(self, agent: Agent = None) -> Crew:
+        """Build a receptionist crew whose task is filled in per message"""
+        agent = agent or self._create_receptionist_agent()
+        task = Task(
+            description=RECEPTIONIST_TASK_TEMPLATE,
+            agent=agent,
+            expected_output="A helpful response to the user's message"
+        )
+        return Crew(
+            agents=[agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=False,
+            # Pooled crews outlive a message; tool results must not be reused across messages
+            cache=False
+        )
+    
+    def _build_clinical_crew(self, agent: Agent = None) -> Crew:
+        """Build a clinical crew whose task is filled in per message"""
+        agent = agent or self._create_clinical_agent()
+        task = Task(
+            description=CLINICAL_TASK_TEMPLATE,
+            agent=agent,
+            expected_output="A thorough clinical answer with citations and appropriate disclaimers"
+        )
+        return Crew(
+            agents=[agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=False,
+            # Pooled crews outlive a message; tool results must not be reused across messages
+            cache=False
+        )
+    
+    def process_message(self, user_message: str, conversation_history: list = None, session_id: str = None) -> str:
         """
         Process a user message and route to appropriate agent.
         
         Args:
             user_message: The user's message
             conversation_history: Previous conversation messages
+            session_id: Conversation identifier; its memory carries the identified
+                patient, earlier retrievals and a summary of older turns
             
         Returns:
             Response from the agent system
         """
+        token = None
         try:
+            memory = self._get_memory(user_message, conversation_history, session_id)
+            token = active_memory.set(memory)
             logger.info(f"Processing message: {user_message[:100]}")
         
             is_medical_question = self._is_medical_question(user_message)
             
             if is_medical_question:
-                
-                response = self._handle_clinical_question(user_message)
+                response = self._answer_clinical_question(user_message, memory)
             else:
                 # Reception
-                response = self._handle_receptionist_task(user_message)
+                response = self._handle_receptionist_task(user_message, memory)
             
+            memory.add_turn(user_message, response)
             logger.info("Message processed successfully")
             return response
             
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}", exc_info=True)
             return f"I apologize, but I encountered an error: {str(e)}. Please try again or contact support."
+        finally:
+            if token is not None:
+                active_memory.reset(token)
     
-    def _is_medical_question(self, message: str) -> bool:
-        """Determine if message is a medical question"""
-        medical_keywords = [
-            'symptom', 'pain', 'medication', 'medicine', 'treatment', 'side effect',
-            'swelling', 'kidney', 'dialysis', 'diet', 'food', 'eat', 'drink',
-            'blood pressure', 'diabetes', 'creatinine', 'protein', 'urine',
-            'should i', 'can i', 'is it normal', 'what if', 'how do i',
-            'concern', 'worried', 'advice', 'recommendation'
-        ]
-        
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in medical_keywords)
-    
-    def _handle_receptionist_task(self, message: str) -> str:
-        """Handle receptionist tasks"""
-        task = Task(
-            description=f"""
-            User message: {message}
-            
-            Your task:
-            1. If this is a greeting, respond warmly and ask for the patient's name
-            2. If the user provides their name, retrieve their discharge summary
-            3. If the user asks a medical question, acknowledge and explain that you're
-               connecting them with a clinical specialist
-            4. Be friendly, professional, and helpful
+    def _get_memory(self, user_message: str, conversation_history: list = None, session_id: str = None) -> ConversationMemory:
+        """
+        Return the memory of the conversation a message belongs to.
+        
+        Sessions keep their memory between messages; without a session id a
+        temporary memory is built from conversation_history. A patient the
+        message identifies by ID or by name is pinned to the conversation, so
+        neither agent needs a patient lookup tool call for it.
+        """
+        # Callers may pass a history that already ends with the current message
+        earlier = list(conversation_history or [])
+        if earlier and earlier[-1].get("role") == "user" and earlier[-1].get("content") == user_message:
+            earlier.pop()
+        
+        if session_id is not None:
+            memory = self.memory.get(session_id, earlier)
+        else:
+            memory = ConversationMemory.from_history(earlier)
+        
+        try:
+            patient = find_patient_in_message(user_message)
+        except Exception as e:
+            # Pinning is best effort; the patient lookup tool reports roster errors itself
+            logger.warning(f"Could not look up the patient in the message: {str(e)}")
+            patient = None
+        if patient is not None and patient != memory.patient:
+            logger.info(f"Pinned patient {patient['patient_id']} to the conversation")
+            memory.remember_patient(patient)
+        return memory
+    
+    def pin_patient(self, session_id: str, patient_id: str) -> Optional[dict]:
+        """
+        Pin a patient to a conversation.
+        
+        Args:
+            session_id: Conversation identifier
+            patient_id: Patient ID (e.g., 'P001')
             
-            Provide a clear, concise response.
-            """,
-            agent=self.receptionist_agent,
-            expected_output="A helpful response to the user's message"
-        )
+        Returns:
+            The pinned patient record, or None if the ID is unknown
+        """
+        patient = get_patient_repository().find_by_id(patient_id)
+        if patient is not None:
+            self.memory.get(session_id).remember_patient(patient)
+        return patient
+    
+    def unpin_patient(self, session_id: str):
+        """Remove the pinned patient from a conversation"""
+        self.memory.get(session_id).forget_patient()
+    
+    def _patient_input(self, memory: ConversationMemory) -> str:
+        """Discharge summary of the conversation's pinned patient, for the task templates"""
+        if memory.patient is None:
+            return NO_PATIENT
+        return format_patient_report(memory.patient, heading=PINNED_PATIENT_HEADING)
+    
+    def get_memory_stats(self, session_id: str) -> dict:
+        """Return a session's memory counters and history size in tokens"""
+        return self.memory.get(session_id).stats()
+    
+    async def aprocess_message(self, user_message: str, conversation_history: list = None, session_id: str = None) -> str:
+        """
+        Process a user message without blocking the event loop.
         
-        crew = Crew(
-            agents=[self.receptionist_agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False
-        )
+        Blocking work (LLM calls, retrieval, embedding) runs on a bounded
+        thread pool shared by all conversations, so one process can keep many
+        conversations in flight. For clinical questions the semantic cache
+        lookup and knowledge-base retrieval run concurrently.
         
-        result = crew.kickoff()
-        return str(result)
+        Args:
+            user_message: The user's message
+            conversation_history: Previous conversation messages
+            session_id: Conversation identifier (see process_message)
+            
+        Returns:
+            Response from the agent system
+        """
+        token = None
+        try:
+            # Patient lookup (roster reload, SQLite) and routing (embedding fallback) block,
+            # so they run on the thread pool like the rest of the request
+            memory = await self._run_blocking(self._get_memory, user_message, conversation_history, session_id)
+            token = active_memory.set(memory)
+            logger.info(f"Processing message (async): {user_message[:100]}")
+            
+            if await self._run_blocking(self._is_medical_question, user_message):
+                response = await self._aanswer_clinical_question(user_message, memory)
+            else:
+                response = await self._run_blocking(self._handle_receptionist_task, user_message, memory)
+            
+            memory.add_turn(user_message, response)
+            logger.info("Message processed successfully")
+            return response
+            
+        except Exception as e:
+            logger.error(f"Error processing message: {str(e)}", exc_info=True)
+            return f"I apologize, but I encountered an error: {str(e)}. Please try again or contact support."
+        finally:
+            if token is not None:
+                active_memory.reset(token)
     
-    def _handle_clinical_question(self, message: str) -> str:
-        """Handle clinical questions with RAG"""
-        # RAG if available
-        context = ""
-        if self.rag_retriever:
-            try:
-                docs = self.rag_retriever.get_relevant_documents(message)
-                context = "\n\n".join([doc.page_content for doc in docs[:3]])
-                logger.info(f"Retrieved {len(docs)} documents from RAG")
-            except Exception as e:
-                logger.warning(f"RAG retrieval failed: {e}")
-                context = ""
+    def stream_message(self, user_message: str, conversation_history: list = None, session_id: str = None) -> Iterator[str]:
+        """
+        Process a user message, yielding the response as it is generated.
         
-        task = Task(
-            description=f"""
-            Patient question: {message}
+        Answer text is streamed from the LLM as the agent writes its final
+        answer; if the model's output cannot be streamed, the full response is
+        yielded once the agent finishes. The concatenated chunks equal the
+        response process_message would return.
+        
+        Args:
+            user_message: The user's message
+            conversation_history: Previous conversation messages
+            session_id: Conversation identifier (see process_message)
             
-            Relevant medical knowledge:
-            {context if context else "Use web search tool for current medical information"}
+        Yields:
+            Consecutive pieces of the response
+        """
+        # The generator may resume in another context, so the memory is activated per step
+        pieces = []
+        try:
+            memory = self._get_memory(user_message, conversation_history, session_id)
+            logger.info(f"Processing message (streaming): {user_message[:100]}")
             
-            Your task:
-            1. Answer the patient's question accurately using the provided medical knowledge
-            2. If you need more current information, use the web search tool
-            3. Provide clear, evidence-based guidance
-            4. Include appropriate warnings signs if relevant
-            5. Always end with a medical disclaimer reminding them to consult their healthcare provider
+            if self._is_medical_question(user_message):
+                stream = self._stream_clinical_question(user_message, memory)
+            else:
+                stream = self._stream_receptionist_task(user_message, memory)
             
-            Provide a comprehensive but clear response.
-            """,
-            agent=self.clinical_agent,
-            expected_output="A thorough clinical answer with citations and appropriate disclaimers"
-        )
+            while True:
+                token = active_memory.set(memory)
+                try:
+                    piece = next(stream)
+                except StopIteration:
+                    break
+                finally:
+                    active_memory.reset(token)
+                pieces.append(piece)
+                yield piece
+            
+            memory.add_turn(user_message, "".join(pieces))
+            logger.info("Message processed successfully")
+            
+        except Exception as e:
+            logger.error(f"Error processing message: {str(e)}", exc_info=True)
+            yield f"I apologize, but I encountered an error: {str(e)}. Please try again or contact support."
+    
+    def _stream_receptionist_task(self, message: str, memory: ConversationMemory) -> Iterator[str]:
+        """Streaming counterpart of _handle_receptionist_task"""
+        inputs = self._receptionist_inputs(message, memory)
+        # The crew goes back to the pool when its kickoff ends, even if the caller stops reading
+        crew = self.receptionist_pool.acquire()
+        on_finish = functools.partial(self.receptionist_pool.release, crew)
+        result, streamed = yield from stream_crew(crew, inputs, on_finish=on_finish)
+        remainder = stream_remainder(streamed, str(result))
+        if remainder:
+            yield remainder
+    
+    def _stream_clinical_question(self, message: str, memory: ConversationMemory) -> Iterator[str]:
+        """Streaming counterpart of _answer_clinical_question"""
+        use_cache, kb_version = self._response_cache_scope(message, memory)
+        if use_cache:
+            cached = self.response_cache.lookup(message, version=kb_version)
+            if cached is not None:
+                logger.info("Answered from semantic response cache")
+                yield cached
+                return
         
-        crew = Crew(
-            agents=[self.clinical_agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False
-        )
+        context = self._session_context(message, memory)
+        inputs = self._clinical_inputs(message, context, memory)
+        crew = self.clinical_pool.acquire()
+        on_finish = functools.partial(self.clinical_pool.release, crew)
+        result, streamed = yield from stream_crew(crew, inputs, on_finish=on_finish)
+        
+        answer = str(result)
+        response = self._add_disclaimer(answer)
+        # The disclaimer is sent even when the streamed text differs from the final answer
+        remainder = stream_remainder(streamed, answer) + response[len(answer):]
+        if remainder:
+            yield remainder
+        if use_cache:
+            self.response_cache.store(message, response, version=kb_version)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for blocking work of async requests (created on first use)"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=CREW_ASYNC_WORKERS,
+                    thread_name_prefix="medical-crew"
+                )
+            return self._executor
+    
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the crew's thread pool"""
+        loop = asyncio.get_running_loop()
+        # Carry context variables (the active conversation memory) into the worker thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(context.run, func, *args))
+    
+    async def _aanswer_clinical_question(self, message: str, memory: ConversationMemory) -> str:
+        """Async counterpart of _answer_clinical_question"""
+        use_cache, kb_version = self._response_cache_scope(message, memory)
+        cache = self.response_cache
+        retrieval = asyncio.ensure_future(self._run_blocking(self._session_context, message, memory))
+        
+        try:
+            if use_cache:
+                cached = await self._run_blocking(cache.lookup, message, kb_version)
+                if cached is not None:
+                    logger.info("Answered from semantic response cache")
+                    return cached
+            context = await retrieval
+        finally:
+            # Not needed after a cache hit or a failed lookup; a retrieval error is
+            # then dropped instead of being logged as never retrieved
+            if not retrieval.done():
+                retrieval.cancel()
+            elif not retrieval.cancelled():
+                retrieval.exception()
+        response = await self._run_blocking(self._run_clinical_crew, message, context, memory)
+        if use_cache:
+            await self._run_blocking(cache.store, message, response, kb_version)
+        return response
+    
+    def close(self):
+        """Shut down the async and prefetch thread pools"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        with self._prefetch_lock:
+            if self._prefetch_executor is not None:
+                self._prefetch_executor.shutdown(wait=False)
+                self._prefetch_executor = None
+    
+    def _is_medical_question(self, message: str) -> bool:
+        """Determine if message is a medical question"""
+        return self.router.is_medical(message)
+    
+    def _handle_receptionist_task(self, message: str, memory: ConversationMemory) -> str:
+        """Handle receptionist tasks"""
+        result = self.receptionist_pool.kickoff(self._receptionist_inputs(message, memory))
+        return str(result)
+    
+    def _receptionist_inputs(self, message: str, memory: ConversationMemory) -> dict:
+        """Inputs for the receptionist task template"""
+        return {"message": message, "history": memory.render(), "patient": self._patient_input(memory)}
+    
+    def _answer_clinical_question(self, message: str, memory: ConversationMemory) -> str:
+        """Answer a clinical question, reusing cached answers to generic questions"""
+        use_cache, kb_version = self._response_cache_scope(message, memory)
+        if use_cache:
+            cached = self.response_cache.lookup(message, version=kb_version)
+            if cached is not None:
+                logger.info("Answered from semantic response cache")
+                return cached
+        
+        response = self._handle_clinical_question(message, memory)
+        if use_cache:
+            self.response_cache.store(message, response, version=kb_version)
+        return response
+    
+    def _response_cache_scope(self, message: str, memory: ConversationMemory):
+        """Return whether the response cache applies to a message, and the knowledge-base version"""
+        if self.response_cache is None:
+            return False, None
+        
+        # Answers that may depend on a specific patient's records are never shared;
+        # with a pinned patient every answer is written around their discharge summary.
+        # Follow-ups are answered in the light of the conversation so far, so only
+        # a conversation's first message is looked up or stored.
+        if memory.patient is not None or memory.has_history() or involves_patient_data(message):
+            self.response_cache.record_bypass()
+            return False, None
+        
+        return True, getattr(self.rag_retriever, "index_version", 0)
+    
+    def get_crew_pool_stats(self) -> dict:
+        """Return build/reuse counters of the receptionist and clinical crew pools"""
+        return {
+            "receptionist": self.receptionist_pool.stats(),
+            "clinical": self.clinical_pool.stats()
+        }
+    
+    def get_response_cache_stats(self) -> dict:
+        """Return semantic response cache counters (empty if the cache is disabled)"""
+        return self.response_cache.stats() if self.response_cache else {}
+    
+    def _handle_clinical_question(self, message: str, memory: ConversationMemory) -> str:
+        """Handle clinical questions with RAG"""
+        context = self._session_context(message, memory)
+        return self._run_clinical_crew(message, context, memory)
+    
+    def _session_context(self, message: str, memory: ConversationMemory) -> str:
+        """Context for a question, reusing what was retrieved for it earlier in the conversation"""
+        context = memory.recall_context(message)
+        if context is None:
+            context = self._gather_context(message)
+            memory.remember_context(message, context)
+        else:
+            logger.info("Reused context retrieved earlier in the conversation")
+        return context
+    
+    def _gather_context(self, message: str) -> str:
+        """
+        Collect the context handed to the clinical task.
+        
+        In speculative mode a web search is started on a separate thread
+        while the knowledge base is searched, and its results are added to
+        the context so the agent rarely needs a web-search tool call. The
+        latency saved per request is the shorter of the two lookups, which
+        would otherwise have run one after the other.
+        """
+        if not self.prefetch_web:
+            return self._retrieve_context(message)
+        
+        start = time.perf_counter()
+        web_future = self._get_prefetch_executor().submit(self._timed_web_search, message)
+        context = self._retrieve_context(message)
+        rag_seconds = time.perf_counter() - start
+        
+        try:
+            web_results, web_seconds = web_future.result(timeout=PREFETCH_WEB_TIMEOUT)
+        except FutureTimeoutError:
+            logger.warning(f"Prefetched web search exceeded {PREFETCH_WEB_TIMEOUT}s; continuing without it")
+            with self._prefetch_lock:
+                self._prefetch_stats["requests"] += 1
+                self._prefetch_stats["web_timeouts"] += 1
+            return context
         
-        result = crew.kickoff()
+        saved_ms = min(rag_seconds, web_seconds) * 1000
+        with self._prefetch_lock:
+            self._prefetch_stats["requests"] += 1
+            self._prefetch_stats["saved_ms"] += saved_ms
+        logger.info(
+            f"Prefetch: RAG {rag_seconds * 1000:.0f} ms, web {web_seconds * 1000:.0f} ms, "
+            f"saved {saved_ms:.0f} ms"
+        )
         
+        # Failed searches are left out; the agent can still use the tool
+        if web_results.startswith(("⚠️", "❌")):
+            return context
+        web_section = (
+            "Current web search results (already retrieved for this question; "
+            "only use the web search tool if they are insufficient):\n" + web_results
+        )
+        return f"{context}\n\n{web_section}" if context else web_section
+    
+    def _timed_web_search(self, message: str):
+        """Run a web search and return its results with the elapsed seconds"""
+        start = time.perf_counter()
+        results = web_search(message)
+        return results, time.perf_counter() - start
+    
+    def _get_prefetch_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for prefetched web searches (separate from the async pool it may be called from)"""
+        with self._prefetch_lock:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(
+                    max_workers=CREW_ASYNC_WORKERS,
+                    thread_name_prefix="web-prefetch"
+                )
+            return self._prefetch_executor
+    
+    def get_context_stats(self) -> dict:
+        """Return prompt tokens of retrieved context, before and after assembly"""
+        return self.context_assembler.stats()
+    
+    def get_prefetch_stats(self) -> dict:
+        """Return speculative prefetch counters and latency saved"""
+        with self._prefetch_lock:
+            stats = dict(self._prefetch_stats)
+        completed = stats["requests"] - stats["web_timeouts"]
+        stats["saved_ms"] = round(stats["saved_ms"], 1)
+        stats["mean_saved_ms"] = round(stats["saved_ms"] / completed, 1) if completed else 0.0
+        return stats
+    
+    def _retrieve_context(self, message: str) -> str:
+        """Retrieve knowledge-base context for a clinical question ("" if unavailable)"""
+        if not self.rag_retriever:
+            return ""
+        try:
+            docs = self.rag_retriever.get_relevant_documents(message)
+            logger.info(f"Retrieved {len(docs)} documents from RAG")
+            context, report = self.context_assembler.assemble(docs)
+            logger.info(
+                f"Context: {report['kept']}/{report['chunks']} chunks, {report['tokens']} tokens "
+                f"({report['tokens_saved']} saved; {report['overlaps_removed']} overlaps, "
+                f"{report['duplicates_dropped']} duplicates removed)"
+            )
+            return context
+        except Exception as e:
+            logger.warning(f"RAG retrieval failed: {e}")
+            return ""
+    
+    def _run_clinical_crew(self, message: str, context: str, memory: ConversationMemory) -> str:
+        """Run the clinical crew on a question and its retrieved context"""
+        result = self.clinical_pool.kickoff(self._clinical_inputs(message, context, memory))
+        return self._add_disclaimer(str(result))
+    
+    def _clinical_inputs(self, message: str, context: str, memory: ConversationMemory) -> dict:
+        """Inputs for the clinical task template"""
+        return {
+            "message": message,
+            "history": memory.render(),
+            "patient": self._patient_input(memory),
+            "context": context if context else "Use web search tool for current medical information"
+        }
+    
+    def _add_disclaimer(self, result_str: str) -> str:
+        """Append the medical disclaimer to an answer that lacks one"""
         # if not present
-        result_str = str(result)
         if "consult" not in result_str.lower() or "disclaimer" not in result_str.lower():
             result_str += "\n\n⚕️ **Medical Disclaimer**: This information is for educational purposes only. Always consult your healthcare provider for personalized medical advice."
         
@@ -265,12 +769,7 @@ class MedicalAICrew:
     
         latest_message = messages[-1]['content']
         
-        
-        context = "\n".join([
-            f"{msg['role']}: {msg['content']}" 
-            for msg in messages[-5:]  
-        ])
-        
+        # Earlier messages become the conversation memory (summarized within its token budget)
         return self.process_message(latest_message, messages)
 
 
@@ -0,0 +1,101 @@
+"""
+Crew Pool
+Reusable pre-built CrewAI crews that only receive per-message inputs
+"""
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+from crewai import Crew
+
+
+# Idle crews kept per pool; concurrent requests beyond this build temporary crews
+CREW_POOL_SIZE = int(os.getenv("CREW_POOL_SIZE", "4"))
+
+
+class CrewPool:
+    """
+    Pool of identically configured crews.
+
+    A crew's tasks are templates whose placeholders (e.g. {message}) are
+    filled by Crew.kickoff(inputs=...). Kickoff rewrites the task
+    descriptions in place, so each crew serves one message at a time and is
+    returned to the pool afterwards. Factories should disable CrewAI's tool
+    result cache, which would otherwise live as long as the crew.
+    """
+
+    def __init__(self, factory: Callable[[], Crew], size: int = CREW_POOL_SIZE):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Builds a new crew with its own agents and task templates
+            size: Maximum number of idle crews kept for reuse
+        """
+        self.factory = factory
+        self.size = size
+        self._idle: "queue.LifoQueue[Crew]" = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def add(self, crew: Crew):
+        """Add an already built crew to the pool (dropped if the pool is full)."""
+        try:
+            self._idle.put_nowait(crew)
+        except queue.Full:
+            pass
+
+    def prewarm(self, count: int = 1):
+        """Build crews ahead of the first message."""
+        for _ in range(min(count, self.size - self._idle.qsize())):
+            self.add(self._build())
+
+    def _build(self) -> Crew:
+        crew = self.factory()
+        with self._lock:
+            self.created += 1
+        return crew
+
+    def acquire(self) -> Crew:
+        """Take an idle crew, building one if none is idle; pass it to release() when done."""
+        try:
+            crew = self._idle.get_nowait()
+            with self._lock:
+                self.reused += 1
+        except queue.Empty:
+            crew = self._build()
+        return crew
+
+    def release(self, crew: Crew):
+        """Return a crew taken with acquire() once it has finished running."""
+        self.add(crew)
+
+    @contextmanager
+    def checkout(self) -> Iterator[Crew]:
+        """Borrow a crew for one message, building one if none is idle."""
+        crew = self.acquire()
+        try:
+            yield crew
+        finally:
+            self.release(crew)
+
+    def kickoff(self, inputs: Dict[str, Any]):
+        """
+        Run a pooled crew on one message.
+
+        Args:
+            inputs: Values for the task template placeholders
+
+        Returns:
+            The crew output
+        """
+        with self.checkout() as crew:
+            return crew.kickoff(inputs=inputs)
+
+    def stats(self) -> dict:
+        """Return build/reuse counters and idle crew count."""
+        with self._lock:
+            return {"created": self.created, "reused": self.reused, "idle": self._idle.qsize(), "size": self.size}
@@ -0,0 +1,212 @@
+"""
+Conversation Memory
+Per-session memory of the identified patient, earlier retrievals and a token-bounded rolling summary
+"""
+import os
+import re
+import threading
+from collections import deque
+from contextvars import ContextVar
+from typing import List, Optional
+
+from rag.embedding_cache import normalize_query
+from utils.cache import LRUCache
+from utils.tokens import estimate_tokens, truncate_to_tokens
+
+
+# Tokens of conversation history added to each task description
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "600"))
+
+# Most recent messages kept verbatim; older ones are folded into the summary
+MEMORY_RECENT_MESSAGES = int(os.getenv("MEMORY_RECENT_MESSAGES", "4"))
+
+# Tokens kept from each older message in the summary
+SUMMARY_LINE_TOKENS = 40
+
+# Retrieved contexts kept per session for repeated questions
+MEMORY_RETRIEVALS = 8
+
+# Sessions kept, and seconds of inactivity before a session is forgotten
+MEMORY_MAX_SESSIONS = int(os.getenv("MEMORY_MAX_SESSIONS", "1000"))
+MEMORY_SESSION_TTL = float(os.getenv("MEMORY_SESSION_TTL", "14400"))
+
+NO_HISTORY = "This is the start of the conversation."
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s|\n")
+MARKDOWN_NOISE = re.compile(r"[*#_`>]+")
+
+# Memory of the conversation being processed, so tools can record what they resolve
+active_memory: ContextVar[Optional["ConversationMemory"]] = ContextVar("active_memory", default=None)
+
+
+def summarize_message(role: str, content: str, max_tokens: int = SUMMARY_LINE_TOKENS) -> str:
+    """
+    Extractive one-line summary of a message: its first non-empty sentence.
+
+    Args:
+        role: "user" or "assistant"
+        content: Message text
+        max_tokens: Token budget of the line
+
+    Returns:
+        "role: first sentence", truncated to max_tokens
+    """
+    text = MARKDOWN_NOISE.sub("", content)
+    sentences = (s.strip() for s in SENTENCE_END.split(text))
+    first = next((s for s in sentences if s), "")
+    return truncate_to_tokens(f"{role}: {' '.join(first.split())}", max_tokens)
+
+
+class ConversationMemory:
+    """Memory of one conversation"""
+
+    def __init__(self, token_budget: int = MEMORY_TOKEN_BUDGET, recent_messages: int = MEMORY_RECENT_MESSAGES):
+        """
+        Initialize an empty memory.
+
+        Args:
+            token_budget: Tokens of history rendered into a prompt
+            recent_messages: Messages kept verbatim before being summarized
+        """
+        self.token_budget = token_budget
+        self.recent_messages = recent_messages
+        self.recent: deque = deque()
+        self.summary: List[str] = []
+        self.summarized = 0
+        self.user_messages = 0
+        self.patient: Optional[dict] = None
+        self.retrievals = LRUCache(maxsize=MEMORY_RETRIEVALS)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_history(cls, messages: List[dict]) -> "ConversationMemory":
+        """Build a memory from earlier {'role', 'content'} messages."""
+        memory = cls()
+        for message in messages:
+            memory.add_message(message["role"], message["content"])
+        return memory
+
+    def add_message(self, role: str, content: str):
+        """Record a message, folding the oldest verbatim message into the summary."""
+        with self._lock:
+            self.recent.append((role, content))
+            if role == "user":
+                self.user_messages += 1
+            while len(self.recent) > self.recent_messages:
+                old_role, old_content = self.recent.popleft()
+                self.summary.append(summarize_message(old_role, old_content))
+                self.summarized += 1
+            # The summary gets at most a third of the budget; the oldest lines go first
+            while self.summary and sum(estimate_tokens(line) for line in self.summary) > self.token_budget // 3:
+                self.summary.pop(0)
+
+    def add_turn(self, user_message: str, response: str):
+        """Record a user message and the reply to it."""
+        self.add_message("user", user_message)
+        self.add_message("assistant", response)
+
+    def has_history(self) -> bool:
+        """
+        Return True once the user has sent a message.
+
+        An assistant greeting that opens a conversation (as the Streamlit app
+        shows) is not history: nothing the user said shapes the next answer yet.
+        """
+        return self.user_messages > 0
+
+    def remember_patient(self, patient: dict):
+        """Pin the patient identified in this conversation."""
+        self.patient = patient
+
+    def forget_patient(self):
+        """Unpin the conversation's patient."""
+        self.patient = None
+
+    def remember_context(self, question: str, context: str):
+        """Record the context retrieved for a question."""
+        self.retrievals.set(normalize_query(question), context)
+
+    def recall_context(self, question: str) -> Optional[str]:
+        """Return the context retrieved earlier for the same question, if any."""
+        return self.retrievals.get(normalize_query(question))
+
+    def render(self) -> str:
+        """
+        Render the conversation for a task description, within the token budget.
+
+        Older messages appear as one-line summaries; recent messages share
+        the remaining budget equally and are truncated to their share.
+        """
+        with self._lock:
+            summary = list(self.summary)
+            recent = list(self.recent)
+            omitted = self.summarized - len(summary)
+
+        # The pinned patient's record is added to task descriptions separately
+        sections = []
+        if summary:
+            header = "Summary of earlier messages"
+            if omitted:
+                header += f" ({omitted} older messages omitted)"
+            sections.append(header + ":\n" + "\n".join(f"- {line}" for line in summary))
+        if recent:
+            remaining = self.token_budget - sum(estimate_tokens(s) for s in sections)
+            share = max(remaining // len(recent), SUMMARY_LINE_TOKENS)
+            sections.append("Recent messages:\n" + "\n".join(
+                f"{role}: {truncate_to_tokens(content, share)}" for role, content in recent
+            ))
+        return "\n\n".join(sections) if sections else NO_HISTORY
+
+    def stats(self) -> dict:
+        """Return message counts and the rendered size."""
+        with self._lock:
+            messages = self.summarized + len(self.recent)
+            summarized = self.summarized
+        return {
+            "messages": messages,
+            "summarized": summarized,
+            "history_tokens": estimate_tokens(self.render()),
+            "patient": self.patient["patient_id"] if self.patient else None,
+            "retrievals": self.retrievals.stats()
+        }
+
+
+class ConversationMemoryStore:
+    """Conversation memories by session id, forgotten after a period of inactivity"""
+
+    def __init__(self, maxsize: int = MEMORY_MAX_SESSIONS, ttl: float = MEMORY_SESSION_TTL):
+        """
+        Initialize the store.
+
+        Args:
+            maxsize: Sessions kept before the least recently active is dropped
+            ttl: Seconds of inactivity after which a session is forgotten
+        """
+        self._sessions = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, history: Optional[List[dict]] = None) -> ConversationMemory:
+        """
+        Return a session's memory, creating it if needed.
+
+        Args:
+            session_id: Conversation identifier
+            history: Earlier messages used to seed a new memory (e.g. after a restart)
+
+        Returns:
+            The session's ConversationMemory
+        """
+        with self._lock:
+            memory = self._sessions.get(session_id)
+            if memory is None:
+                memory = ConversationMemory.from_history(history or [])
+            # Re-setting refreshes the inactivity timeout
+            self._sessions.set(session_id, memory)
+            return memory
+
+    def clear(self, session_id: str):
+        """Forget a session."""
+        self._sessions.pop(session_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
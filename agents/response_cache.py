@@ -0,0 +1,212 @@
+"""
+Semantic Response Cache
+Reuses answers to generic clinical questions whose embeddings are near-identical
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+import numpy as np
+
+from rag.embedding_cache import normalize_query
+from tools.patient_tool import INTRODUCTION_PATTERN
+
+
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "True").lower() == "true"
+
+# Minimum cosine similarity between question embeddings for a cached answer to be reused.
+# Kept high: questions that differ only by a negation ("should I ..." / "should I not ...")
+# embed almost identically but need different answers.
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "256"))
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "86400"))
+
+# Messages that mention a patient ID or the user's own records are never cached
+PATIENT_DATA_PATTERN = re.compile(
+    r"\bP\d{3,}\b"
+    r"|\bpatient\s+id\b"
+    r"|\bmy\s+name\s+is\b"
+    r"|\bmy\s+(?:discharge|summary|report|records?|diagnosis|medications?|meds|prescriptions?"
+    r"|labs?|lab\s+results|results|test\s+results|creatinine|egfr)\b",
+    re.IGNORECASE
+)
+
+
+def involves_patient_data(message: str) -> bool:
+    """
+    Return True if the message refers to a specific patient or their records.
+
+    Besides patient IDs and references to the user's own records, this
+    covers self-introductions with a capitalized name ("I'm John Smith,
+    what should I eat?"), whether or not the name is on the roster. Known
+    patients named in a message are also pinned to the conversation, which
+    bypasses the cache on its own.
+    """
+    if PATIENT_DATA_PATTERN.search(message) is not None:
+        return True
+    return any(match.group(1)[:1].isupper() for match in INTRODUCTION_PATTERN.finditer(message))
+
+
+class SemanticResponseCache:
+    """Bounded cache of answers keyed by question embedding and knowledge-base version"""
+
+    def __init__(
+        self,
+        embeddings,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        maxsize: int = SEMANTIC_CACHE_SIZE,
+        ttl: Optional[float] = SEMANTIC_CACHE_TTL
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            embeddings: Embeddings used for questions (embed_query)
+            threshold: Minimum cosine similarity for a hit
+            maxsize: Maximum number of cached answers
+            ttl: Seconds an answer stays valid (None: no expiry)
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._matrix = None
+        self._keys = []
+        self._version: Optional[Hashable] = None
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    def _embed(self, question: str) -> np.ndarray:
+        """Embed a question as a unit vector."""
+        vector = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _check_version(self, version: Hashable):
+        """Drop every answer produced against a different knowledge-base version."""
+        if version != self._version:
+            self._entries.clear()
+            self._matrix = None
+            self._version = version
+
+    def _drop_expired(self):
+        """Remove answers older than the TTL."""
+        now = time.monotonic()
+        expired = [key for key, (_, _, expires_at) in self._entries.items()
+                   if expires_at is not None and now >= expires_at]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._matrix = None
+
+    def lookup(self, question: str, version: Hashable = 0) -> Optional[str]:
+        """
+        Return a cached answer for a semantically equivalent question.
+
+        Args:
+            question: The user's question
+            version: Knowledge-base version the answer must have been produced with
+
+        Returns:
+            The cached answer, or None on a miss
+        """
+        key = normalize_query(question)
+        with self._lock:
+            self._check_version(version)
+            self._drop_expired()
+            entry = self._entries.get(key)
+            candidates = bool(self._entries)
+
+        # Embed outside the lock; only needed when there is no exact match
+        vector = self._embed(question) if entry is None and candidates else None
+
+        with self._lock:
+            if vector is not None and self._entries and version == self._version:
+                if self._matrix is None:
+                    self._keys = list(self._entries)
+                    self._matrix = np.stack([self._entries[k][0] for k in self._keys])
+                scores = self._matrix @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    key = self._keys[best]
+                    entry = self._entries[key]
+
+            if entry is None or key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def store(self, question: str, answer: str, version: Hashable = 0):
+        """
+        Cache an answer.
+
+        Answers produced against an older knowledge-base version than the
+        one last looked up (a request that started before a re-index) are
+        not stored.
+
+        Args:
+            question: The question that was answered
+            answer: The answer to reuse
+            version: Knowledge-base version the answer was produced with
+        """
+        vector = self._embed(question)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if self._version is None:
+                self._version = version
+            elif version != self._version:
+                return
+            self._entries[normalize_query(question)] = (vector, answer, expires_at)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def record_bypass(self):
+        """Count a question that skipped the cache because it involves patient data."""
+        with self._lock:
+            self.bypasses += 1
+
+    def clear(self):
+        """Drop all cached answers; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    def stats(self) -> dict:
+        """Return hit/miss/bypass counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypasses": self.bypasses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "threshold": self.threshold
+            }
+
+
+def create_response_cache(rag_retriever=None) -> Optional[SemanticResponseCache]:
+    """
+    Build a response cache sharing the knowledge base's embedding model.
+
+    Args:
+        rag_retriever: Retriever returned by NephrologyRAG.get_retriever
+
+    Returns:
+        SemanticResponseCache, or None if disabled or no embeddings are available
+    """
+    rag = getattr(rag_retriever, "rag", None)
+    if not SEMANTIC_CACHE_ENABLED or rag is None:
+        return None
+    return SemanticResponseCache(rag.embeddings)
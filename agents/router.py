@@ -0,0 +1,175 @@
+"""
+Intent Router
+Routes messages to the receptionist or clinical agent with a compiled regex and an embedding fallback
+"""
+import re
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+
+RECEPTIONIST = "receptionist"
+CLINICAL = "clinical"
+
+# Clinical vocabulary; each match counts 2
+STRONG_MEDICAL_TERMS = [
+    r"symptoms?", r"pain(?:s|ful)?", r"hurts?", r"aches?", r"aching", r"sore",
+    r"medications?", r"medicines?", r"meds", r"pills?", r"tablets?", r"doses?", r"dosage",
+    r"treatments?", r"side[- ]effects?", r"swelling", r"swollen", r"puffy", r"edema", r"oedema",
+    r"kidneys?", r"renal", r"nephro\w*", r"dialysis", r"transplant\w*", r"diet(?:ary)?",
+    r"foods?", r"eat(?:s|ing)?", r"drink(?:s|ing)?", r"fluids?", r"salt", r"sodium",
+    r"potassium", r"phosph\w*", r"proteins?", r"blood pressure", r"bp", r"diabet\w*",
+    r"blood sugar", r"creatinine", r"egfr", r"urine", r"urinat\w*", r"pee(?:ing)?",
+    r"nause\w*", r"vomit\w*", r"fever", r"dizz\w*", r"fatigue", r"tired", r"exhausted",
+    r"short(?:ness)? of breath", r"breath(?:e|ing|less)?", r"cramps?", r"itch\w*",
+    r"infections?", r"bleed\w*", r"weight", r"exercise", r"warning signs?", r"emergency",
+    r"ibuprofen", r"nsaids?", r"tylenol", r"acetaminophen", r"paracetamol", r"insulin",
+    r"lisinopril", r"furosemide", r"diuretics?", r"alcohol", r"coffee", r"caffeine",
+    r"headaches?", r"weak(?:ness)?", r"chills", r"thirsty?",
+]
+
+# Question and concern cues; each match counts 1
+WEAK_MEDICAL_TERMS = [
+    r"should i", r"can i", r"is it normal", r"is it safe", r"is it ok(?:ay)?", r"what if",
+    r"how do i", r"how much", r"how often", r"concern(?:ed|s)?", r"worried", r"worry",
+    r"advice", r"recommend\w*", r"normal", r"i feel", r"feeling",
+]
+
+# Greetings and small talk; each match counts 1, so a greeting never outweighs a symptom
+GREETING_TERMS = [
+    r"hello", r"hi", r"hey", r"good (?:morning|afternoon|evening)", r"thanks?", r"thank you",
+    r"bye", r"goodbye",
+]
+
+# Identification and records; each match counts 2
+RECEPTION_TERMS = [
+    r"my name is", r"patient id", r"p\d{3,}", r"discharge summary", r"summary",
+    r"reports?", r"records?", r"discharge (?:papers|instructions|date)", r"look me up",
+    r"find my", r"appointment", r"who are you", r"what can you do",
+]
+
+_WEIGHTS = {"strong": 2, "weak": 1, "greeting": 1, "reception": 2}
+
+
+def _alternation(terms: List[str]) -> str:
+    # Longest first so multi-word phrases win over their prefixes
+    return "|".join(sorted(terms, key=len, reverse=True))
+
+
+ROUTING_PATTERN = re.compile(
+    rf"\b(?:(?P<strong>{_alternation(STRONG_MEDICAL_TERMS)})"
+    rf"|(?P<weak>{_alternation(WEAK_MEDICAL_TERMS)})"
+    rf"|(?P<greeting>{_alternation(GREETING_TERMS)})"
+    rf"|(?P<reception>{_alternation(RECEPTION_TERMS)}))\b",
+    re.IGNORECASE
+)
+
+# Example messages for the embedding fallback, used when no keyword decides
+PROTOTYPES = {
+    CLINICAL: [
+        "My ankles look bigger than usual",
+        "I feel sick after my treatment",
+        "Is it bad that my mouth is always dry",
+        "What happens if I skip a session",
+        "My skin has turned a strange colour",
+        "There is a rash around my fistula",
+        "I can't sleep at night because my legs twitch",
+        "What are the signs my kidney function is getting worse",
+    ],
+    RECEPTIONIST: [
+        "Hello there",
+        "My name is John Smith",
+        "Can you pull up my discharge paperwork",
+        "I was discharged last week from the hospital",
+        "Who am I speaking with",
+        "Thanks for your help",
+        "I'd like to see my hospital records",
+        "Good morning, I'm a patient",
+    ],
+}
+
+
+class IntentRouter:
+    """Deterministic message router"""
+
+    def __init__(self, embeddings=None):
+        """
+        Initialize the router.
+
+        Args:
+            embeddings: Optional embeddings (e.g. the knowledge base's MiniLM) for
+                messages that keywords cannot decide
+        """
+        self.embeddings = embeddings
+        self._labels: List[str] = []
+        self._centroids: Optional[np.ndarray] = None
+        self._centroid_lock = threading.Lock()
+
+    def keyword_scores(self, message: str) -> dict:
+        """
+        Return the weighted keyword scores of a message.
+
+        Returns:
+            Clinical and receptionist scores, and "strong": the number of
+            strong medical terms matched
+        """
+        scores = {CLINICAL: 0, RECEPTIONIST: 0, "strong": 0}
+        for match in ROUTING_PATTERN.finditer(message):
+            group = match.lastgroup
+            scores[RECEPTIONIST if group in ("greeting", "reception") else CLINICAL] += _WEIGHTS[group]
+            if group == "strong":
+                scores["strong"] += 1
+        return scores
+
+    def _get_centroids(self) -> np.ndarray:
+        """Embed the prototypes once and return one unit-length centroid per label."""
+        with self._centroid_lock:
+            if self._centroids is None:
+                labels, centroids = [], []
+                for label, examples in PROTOTYPES.items():
+                    vectors = np.asarray(self.embeddings.embed_documents(examples), dtype=np.float32)
+                    centroid = vectors.mean(axis=0)
+                    labels.append(label)
+                    centroids.append(centroid / np.linalg.norm(centroid))
+                self._labels = labels
+                self._centroids = np.stack(centroids)
+            return self._centroids
+
+    def classify_by_embedding(self, message: str) -> str:
+        """Return the label of the nearest prototype centroid."""
+        centroids = self._get_centroids()
+        vector = np.asarray(self.embeddings.embed_query(message), dtype=np.float32)
+        return self._labels[int(np.argmax(centroids @ vector))]
+
+    def route(self, message: str) -> str:
+        """
+        Route a message.
+
+        Keyword scores decide when they differ. A tie with a strong medical
+        term ("My name is John Smith, I have swelling") goes to the clinical
+        agent, so a symptom is never triaged as small talk. Other ties
+        (including messages with no keywords) go to the embedding classifier
+        when available, otherwise to the receptionist.
+
+        Args:
+            message: The user's message
+
+        Returns:
+            CLINICAL or RECEPTIONIST
+        """
+        scores = self.keyword_scores(message)
+        if scores[CLINICAL] != scores[RECEPTIONIST]:
+            return CLINICAL if scores[CLINICAL] > scores[RECEPTIONIST] else RECEPTIONIST
+        if scores["strong"]:
+            return CLINICAL
+        if self.embeddings is not None:
+            try:
+                return self.classify_by_embedding(message)
+            except Exception:
+                pass
+        return RECEPTIONIST
+
+    def is_medical(self, message: str) -> bool:
+        """Return True if the message should go to the clinical agent."""
+        return self.route(message) == CLINICAL
@@ -0,0 +1,199 @@
+"""
+Crew Streaming
+Streams an agent's final answer from CrewAI LLM chunk events while it is generated
+"""
+import contextvars
+import copy
+import queue
+import threading
+from typing import Any, Callable, Dict, Generator, Optional, Tuple
+
+from crewai import Crew
+from crewai.events.event_bus import crewai_event_bus
+from crewai.events.types.llm_events import LLMStreamChunkEvent
+
+
+# Agents prefix their answer with this marker; text before it is reasoning and tool calls
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+_DONE = object()
+_NEW_CALL = object()
+
+# Chunk queues of the agents currently streaming, by agent id
+_subscribers: Dict[str, queue.Queue] = {}
+_subscribers_lock = threading.Lock()
+_dispatcher_registered = False
+
+def _dispatch_chunk(source: Any, event: LLMStreamChunkEvent):
+    """Route an LLM chunk to the queue of the agent that produced it."""
+    if event.tool_call is not None:
+        return
+    subscriber = _subscribers.get(event.agent_id)
+    if subscriber is not None:
+        subscriber.put(event.chunk)
+
+
+def _ensure_dispatcher():
+    """Register the event bus handler once; CrewAI offers no public way to remove handlers."""
+    global _dispatcher_registered
+    with _subscribers_lock:
+        if not _dispatcher_registered:
+            crewai_event_bus.register_handler(LLMStreamChunkEvent, _dispatch_chunk)
+            _dispatcher_registered = True
+
+
+def _streaming_llm(llm: Any, chunks: queue.Queue) -> Any:
+    """
+    Return a streaming copy of an agent's LLM for one kickoff.
+
+    The LLM may be shared with other crews, so its own settings are left
+    alone. The copy marks the start of each LLM call in the chunk queue,
+    so the answer filter can drop output of a call the agent retries.
+    """
+    streaming = copy.copy(llm)
+    streaming.stream = True
+    call = type(llm).call
+
+    def call_and_mark(*args, **kwargs):
+        chunks.put(_NEW_CALL)
+        return call(streaming, *args, **kwargs)
+
+    streaming.call = call_and_mark
+    return streaming
+
+
+class FinalAnswerFilter:
+    """Passes through only the text after the final-answer marker"""
+
+    def __init__(self):
+        self.emitted = ""
+        self.new_call()
+
+    def new_call(self):
+        """Start on the output of a new LLM call; text already emitted is kept."""
+        self._text = ""
+        self._start = None
+        self._position = 0
+        self._answer = ""
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add a chunk of LLM output.
+
+        Args:
+            chunk: Next piece of streamed text
+
+        Returns:
+            Newly available answer text ("" while still before the marker)
+        """
+        self._text += chunk
+        if self._start is None:
+            index = self._text.find(FINAL_ANSWER_MARKER)
+            if index < 0:
+                return ""
+            self._start = self._position = index + len(FINAL_ANSWER_MARKER)
+
+        new = self._text[self._position:]
+        if not self._answer:
+            new = new.lstrip()
+            if not new:
+                return ""
+        self._position = len(self._text)
+        self._answer += new
+        self.emitted += new
+        return new
+
+
+def stream_crew(
+    crew: Crew,
+    inputs: Dict[str, Any],
+    on_finish: Optional[Callable[[], None]] = None
+) -> Generator[str, None, Tuple[Any, str]]:
+    """
+    Run a crew and yield its final answer as the LLM produces it.
+
+    The crew runs in a background thread; chunks are matched to it by agent
+    id, so concurrent crews do not see each other's output. Use as
+    `result, streamed = yield from stream_crew(crew, inputs)`.
+
+    If the caller stops iterating early, the kickoff still runs to the end
+    in its thread, so a pooled crew must be returned through on_finish
+    rather than when the generator is closed.
+
+    Args:
+        crew: Crew to run (not shared with other callers while streaming)
+        inputs: Values for the task template placeholders
+        on_finish: Called from the kickoff thread once the crew has finished
+
+    Returns:
+        The crew output and the text that was streamed (may be empty if the
+        model produced no final-answer marker)
+    """
+    _ensure_dispatcher()
+    chunks: queue.Queue = queue.Queue()
+    agent_ids = [str(agent.id) for agent in crew.agents]
+
+    outcome = {}
+
+    def run():
+        originals = [agent.llm for agent in crew.agents]
+        try:
+            for agent in crew.agents:
+                if hasattr(agent.llm, "stream"):
+                    agent.llm = _streaming_llm(agent.llm, chunks)
+            outcome["result"] = crew.kickoff(inputs=inputs)
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            for agent, llm in zip(crew.agents, originals):
+                agent.llm = llm
+            if on_finish is not None:
+                on_finish()
+            chunks.put(_DONE)
+
+    with _subscribers_lock:
+        for agent_id in agent_ids:
+            _subscribers[agent_id] = chunks
+
+    answer = FinalAnswerFilter()
+    try:
+        # The crew's tools see the caller's context variables (e.g. the conversation memory)
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(run,), name="crew-stream", daemon=True).start()
+        while True:
+            chunk = chunks.get()
+            if chunk is _DONE:
+                break
+            if chunk is _NEW_CALL:
+                answer.new_call()
+                continue
+            text = answer.feed(chunk)
+            if text:
+                yield text
+    finally:
+        with _subscribers_lock:
+            for agent_id in agent_ids:
+                _subscribers.pop(agent_id, None)
+
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"], answer.emitted
+
+
+def stream_remainder(streamed: str, final: str) -> str:
+    """
+    Return the part of the final response not yet streamed.
+
+    Args:
+        streamed: Text already sent to the user
+        final: Complete response (e.g. with a disclaimer appended)
+
+    Returns:
+        Text to send after the streamed part
+    """
+    if not streamed:
+        return final
+    sent = streamed.rstrip()
+    if final.startswith(sent):
+        return final[len(sent):]
+    return ""
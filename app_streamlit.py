@@ -6,6 +6,7 @@ import streamlit as st
 import os
 import sys
 import logging
+import uuid
 from config import validate_config, MODEL_NAME
 from logger import logger
 from datetime import datetime
@@ -28,10 +29,9 @@ except Exception as e:
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Import custom modules
-from agents.crew import create_medical_crew
-from rag.loader import setup_rag_system
+# Import custom modules (agents and RAG are imported by the startup threads)
 from utils.logger import get_logger
+from utils.startup import SystemLoader
 
 # Page configuration
 st.set_page_config(
@@ -89,27 +89,22 @@ st.markdown("""
 
 @st.cache_resource
 def initialize_system():
-    """Initialize the AI system (cached for performance)"""
-    try:
-        # Initialize logger
-        logger = get_logger()
-        logger.log_system_event("Streamlit app started")
-        
-        # Setup RAG system
-        with st.spinner("Loading nephrology knowledge base..."):
-            rag = setup_rag_system()
-            retriever = rag.get_retriever(k=3)
-        
-        # Create medical crew
-        with st.spinner("Initializing AI agents..."):
-            crew = create_medical_crew(rag_retriever=retriever)
-        
-        logger.log_system_event("System initialization complete")
-        return crew, logger, True
-        
-    except Exception as e:
-        st.error(f"Error initializing system: {str(e)}")
-        return None, None, False
+    """Start loading the AI system in background threads (cached for performance)"""
+    # Initialize logger
+    logger = get_logger()
+    logger.log_system_event("Streamlit app started")
+    
+    # Knowledge base and agents load in parallel while the page renders
+    loader = SystemLoader().start()
+    return loader, logger
+
+
+def get_crew(loader: SystemLoader):
+    """Wait for background startup to finish and return the crew"""
+    if loader.ready:
+        return loader.wait()
+    with st.spinner("Loading nephrology knowledge base and AI agents..."):
+        return loader.wait()
 
 
 def main():
@@ -130,11 +125,7 @@ def main():
     """, unsafe_allow_html=True)
     
     # Initialize system
-    crew, logger, initialized = initialize_system()
-    
-    if not initialized:
-        st.error("❌ System initialization failed. Please check your configuration and try again.")
-        st.stop()
+    loader, logger = initialize_system()
     
     # Sidebar
     with st.sidebar:
@@ -153,14 +144,24 @@ def main():
         st.header("📊 Session Info")
         if 'message_count' not in st.session_state:
             st.session_state.message_count = 0
+        if 'session_id' not in st.session_state:
+            st.session_state.session_id = str(uuid.uuid4())
         st.metric("Messages Exchanged", st.session_state.message_count)
         
+        with st.expander("⏱️ Startup"):
+            if loader.ready:
+                st.code(loader.timer.report())
+            else:
+                st.caption("Loading knowledge base and agents in the background...")
+        
         st.divider()
         
         st.header("🔧 Quick Actions")
         if st.button("🔄 Clear Conversation"):
             st.session_state.messages = []
             st.session_state.message_count = 0
+            # Start a new conversation memory as well
+            st.session_state.session_id = str(uuid.uuid4())
             logger.log_system_event("Conversation cleared by user")
             st.rerun()
         
@@ -230,32 +231,39 @@ def main():
         
         # Get AI response
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                try:
-                    # Process message through crew
-                    response = crew.process_message(prompt, st.session_state.messages)
-                    
-                    # Log conversation
-                    logger.log_conversation(
-                        user_message=prompt,
-                        agent_response=response,
-                        agent_type="auto-routed",
-                        metadata={"message_count": st.session_state.message_count}
-                    )
-                    
-                    # Display response
-                    st.markdown(response)
-                    
-                    # Add to message history
-                    st.session_state.messages.append({"role": "assistant", "content": response})
-                    st.session_state.message_count += 1
-                    
-                except Exception as e:
-                    error_msg = f"I apologize, but I encountered an error processing your request: {str(e)}\n\nPlease try again or rephrase your question."
-                    st.error(error_msg)
-                    logger.log_error(e, context="Processing user message", user_id="streamlit_user")
-                    
-                    st.session_state.messages.append({"role": "assistant", "content": error_msg})
+            try:
+                crew = get_crew(loader)
+            except Exception as e:
+                st.error(f"❌ System initialization failed: {str(e)}. Please check your configuration and try again.")
+                logger.log_error(e, context="System initialization")
+                st.stop()
+            
+            try:
+                # Stream the response through the crew as it is generated
+                response = st.write_stream(crew.stream_message(
+                    prompt,
+                    st.session_state.messages,
+                    session_id=st.session_state.session_id
+                ))
+                
+                # Log conversation
+                logger.log_conversation(
+                    user_message=prompt,
+                    agent_response=response,
+                    agent_type="auto-routed",
+                    metadata={"message_count": st.session_state.message_count}
+                )
+                
+                # Add to message history
+                st.session_state.messages.append({"role": "assistant", "content": response})
+                st.session_state.message_count += 1
+                
+            except Exception as e:
+                error_msg = f"I apologize, but I encountered an error processing your request: {str(e)}\n\nPlease try again or rephrase your question."
+                st.error(error_msg)
+                logger.log_error(e, context="Processing user message", user_id="streamlit_user")
+                
+                st.session_state.messages.append({"role": "assistant", "content": error_msg})
         
         # Rerun to update the display
         st.rerun()
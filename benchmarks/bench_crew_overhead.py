@@ -0,0 +1,110 @@
+"""
+Crew Setup Overhead Benchmark
+Compares per-message non-LLM setup cost of building a Task and Crew against reusing a pooled crew
+
+Usage:
+    python benchmarks/bench_crew_overhead.py
+    python benchmarks/bench_crew_overhead.py --messages 500
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crewai import Agent, Crew, Process, Task
+from crewai.llms.base_llm import BaseLLM
+
+from agents.crew import CLINICAL_TASK_TEMPLATE, NO_PATIENT
+from agents.crew_pool import CrewPool
+from agents.memory import NO_HISTORY
+
+MESSAGES = [
+    "What should I eat?",
+    "I have swelling in my legs, is that normal?",
+    "Can I take ibuprofen for pain?",
+    "How much water should I drink a day?",
+]
+
+CONTEXT = "Limit sodium to 2 g/day. Report sudden weight gain over 2 kg in 2 days."
+
+
+class UnusedLLM(BaseLLM):
+    """Placeholder LLM so the benchmark needs no provider or API key; never called."""
+
+    def call(self, messages, *args, **kwargs):
+        raise RuntimeError("The overhead benchmark does not call the LLM")
+
+
+def make_agent() -> Agent:
+    """Clinical agent without tools."""
+    return Agent(
+        role="Nephrology Clinical Assistant",
+        goal="Answer patient medical questions accurately using the nephrology knowledge base",
+        backstory="You are an AI clinical assistant specialized in nephrology.",
+        llm=UnusedLLM(model="unused"),
+        verbose=False,
+        allow_delegation=False
+    )
+
+
+def make_crew(agent: Agent) -> Crew:
+    task = Task(description=CLINICAL_TASK_TEMPLATE, agent=agent, expected_output="A thorough clinical answer")
+    return Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=False)
+
+
+def per_message_rebuild(agent: Agent, message: str):
+    """Previous behavior: a new Task and Crew per message."""
+    task = Task(
+        description=CLINICAL_TASK_TEMPLATE.replace("{message}", message).replace("{context}", CONTEXT).replace("{history}", NO_HISTORY).replace("{patient}", NO_PATIENT),
+        agent=agent,
+        expected_output="A thorough clinical answer"
+    )
+    return Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=False)
+
+
+def per_message_pooled(pool: CrewPool, message: str):
+    """Pooled behavior: borrow a crew and interpolate the inputs, as kickoff(inputs=...) does."""
+    with pool.checkout() as crew:
+        crew._interpolate_inputs({"message": message, "context": CONTEXT, "history": NO_HISTORY, "patient": NO_PATIENT})
+        return crew
+
+
+def measure(fn, messages: int) -> list:
+    timings = []
+    for i in range(messages):
+        start = time.perf_counter()
+        fn(MESSAGES[i % len(MESSAGES)])
+        timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    args = parser.parse_args()
+
+    agent = make_agent()
+    pool = CrewPool(lambda: make_crew(make_agent()))
+    pool.prewarm()
+
+    # Warm up both paths
+    measure(lambda m: per_message_rebuild(agent, m), 10)
+    measure(lambda m: per_message_pooled(pool, m), 10)
+
+    print(f"{'path':<10} {'p50 us':>10} {'p95 us':>10} {'mean us':>10}")
+    for name, fn in (
+        ("rebuild", lambda m: per_message_rebuild(agent, m)),
+        ("pooled", lambda m: per_message_pooled(pool, m)),
+    ):
+        timings = sorted(measure(fn, args.messages))
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{name:<10} {statistics.median(timings):>10.0f} {p95:>10.0f} {statistics.mean(timings):>10.0f}")
+    print(f"pool: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Embedding Throughput Benchmark
+Reports CPU chunks/sec for batch size, thread count and quantization settings
+
+Usage:
+    python benchmarks/bench_embeddings.py
+    python benchmarks/bench_embeddings.py --batch-sizes 32 64 --threads 4 8 --chunks 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.embedding_engine import BatchedEmbeddings
+from rag.ingest import create_text_splitter
+from rag.loader import EMBEDDING_MODEL_NAME, create_sample_nephrology_content
+
+
+def make_chunks(count: int, seed: int = 0):
+    """Build `count` chunks of realistic, varied length from the sample guide."""
+    from langchain.schema import Document
+
+    rng = random.Random(seed)
+    base = []
+    for chunk_size in (200, 500, 1000):
+        splitter = create_text_splitter(chunk_size, chunk_size // 5)
+        base.extend(doc.page_content for doc in splitter.split_documents(
+            [Document(page_content=create_sample_nephrology_content())]
+        ))
+    return [rng.choice(base) for _ in range(count)]
+
+
+def run(model_name: str, chunks, batch_size: int, threads: int, quantize: bool, unsorted: bool = False) -> float:
+    """Embed all chunks once and return chunks/sec (after one warm-up batch)."""
+    engine = BatchedEmbeddings(model_name, batch_size=batch_size, num_threads=threads, quantize=quantize)
+    engine.embed_documents(chunks[:batch_size])
+
+    start = time.perf_counter()
+    if unsorted:
+        # Plain fixed-size batches in input order, for comparison with length bucketing
+        for i in range(0, len(chunks), batch_size):
+            engine._encode(chunks[i:i + batch_size])
+    else:
+        engine.embed_documents(chunks)
+    return len(chunks) / (time.perf_counter() - start)
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    parser.add_argument("--chunks", type=int, default=1000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--threads", type=int, nargs="+", default=sorted({1, max(1, cores // 2), cores}))
+    parser.add_argument("--no-quantize", action="store_true", help="Skip the int8 runs")
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.chunks)
+    quantize_options = [False] if args.no_quantize else [False, True]
+
+    print(f"{args.model}: {args.chunks} chunks, {cores} cores")
+    print(f"{'batch':>6} {'threads':>8} {'int8':>5} {'sorted/s':>10} {'unsorted/s':>11}")
+    for quantize in quantize_options:
+        for threads in args.threads:
+            for batch_size in args.batch_sizes:
+                sorted_rate = run(args.model, chunks, batch_size, threads, quantize)
+                unsorted_rate = run(args.model, chunks, batch_size, threads, quantize, unsorted=True)
+                print(f"{batch_size:>6} {threads:>8} {str(quantize):>5} {sorted_rate:>10.1f} {unsorted_rate:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Fuzzy Name Index Benchmark
+Measures build time, query latency and top-1 accuracy on misspelled names
+
+Usage:
+    python benchmarks/bench_name_index.py
+    python benchmarks/bench_name_index.py --sizes 10000 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.name_index import NameIndex
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+SYLLABLES = ["an", "ber", "ca", "del", "er", "fa", "gon", "har", "is", "jo", "kin", "lo", "mar",
+             "ne", "or", "pa", "quin", "ro", "son", "ta", "ul", "ve", "wil", "xa", "yo", "zel"]
+
+
+def make_name(rng: random.Random, first_names) -> str:
+    """Build a synthetic normalized name with a diverse surname."""
+    surname = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    middle = f" {rng.choice('abcdefghijklmnopqrstuvwxyz')}." if rng.random() < 0.3 else ""
+    return f"{rng.choice(first_names)}{middle} {surname}"
+
+
+def misspell(rng: random.Random, name: str) -> str:
+    """Apply one realistic typing error: drop the middle initial or edit one character."""
+    tokens = name.split()
+    if len(tokens) == 3 and rng.random() < 0.5:
+        return f"{tokens[0]} {tokens[2]}"
+    index = rng.randrange(len(tokens))
+    token = tokens[index]
+    if len(token) > 3:
+        position = rng.randrange(1, len(token))
+        edit = rng.choice(["delete", "replace", "insert"])
+        if edit == "delete":
+            token = token[:position] + token[position + 1:]
+        elif edit == "replace":
+            token = token[:position] + rng.choice("aeiouy") + token[position + 1:]
+        else:
+            token = token[:position] + rng.choice("aeiouy") + token[position:]
+    tokens[index] = token
+    return " ".join(tokens)
+
+
+def run(size: int, queries: int):
+    rng = random.Random(size)
+    first_names = ["".join(rng.choice(SYLLABLES) for _ in range(2)) for _ in range(2000)]
+    names = list({make_name(rng, first_names) for _ in range(size)})
+
+    start = time.perf_counter()
+    index = NameIndex(names)
+    build_seconds = time.perf_counter() - start
+
+    latencies = []
+    hits = 0
+    for _ in range(queries):
+        target = rng.choice(names)
+        query = misspell(rng, target)
+        start = time.perf_counter()
+        results = index.search(query, limit=5)
+        latencies.append((time.perf_counter() - start) * 1e6)
+        if results and results[0][0] == target:
+            hits += 1
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{len(names):>10} {build_seconds:>9.2f} {statistics.median(latencies):>9.1f} "
+          f"{p99:>9.1f} {hits / queries:>9.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'names':>10} {'build s':>9} {'p50 us':>9} {'p99 us':>9} {'top-1':>9}")
+    for size in args.sizes:
+        run(size, args.queries)
+
+
+if __name__ == "__main__":
+    main()
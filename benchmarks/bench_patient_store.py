@@ -0,0 +1,154 @@
+"""
+Patient Store Ingestion Benchmark
+Measures build time, peak RSS and lookup latency of the patient repositories
+
+Usage:
+    python benchmarks/bench_patient_store.py
+    python benchmarks/bench_patient_store.py --sizes 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add project root to path for imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+MODES = ["json_load", "stream_array", "stream_jsonl", "sqlite"]
+
+FIRST_NAMES = ["John", "Maria", "Robert", "Linda", "Elizabeth", "James", "Aisha", "Wei", "Priya", "Carlos"]
+LAST_NAMES = ["Smith", "Garcia", "Johnson", "Martinez", "Lee", "Brown", "Khan", "Chen", "Patel", "Lopez"]
+DIAGNOSES = ["Chronic Kidney Disease Stage 3", "Acute Kidney Injury - Resolved", "ESRD on Hemodialysis",
+             "Nephrotic Syndrome", "Kidney Transplant - Stable"]
+
+
+def synthetic_patient(i: int, rng: random.Random) -> dict:
+    """Build one synthetic patient record shaped like data/patients.json."""
+    return {
+        "patient_id": f"P{i:07d}",
+        "patient_name": f"{rng.choice(FIRST_NAMES)} {chr(65 + i % 26)}. {rng.choice(LAST_NAMES)} {i}",
+        "age": rng.randint(18, 95),
+        "gender": rng.choice(["Male", "Female"]),
+        "discharge_date": "2024-01-15",
+        "primary_diagnosis": rng.choice(DIAGNOSES),
+        "secondary_diagnosis": "Hypertension, Type 2 Diabetes",
+        "medications": ["Lisinopril 10mg daily", "Furosemide 20mg twice daily", "Metformin 500mg twice daily"],
+        "dietary_restrictions": "Low sodium (2g/day), fluid restriction (1.5L/day), protein restriction (0.8g/kg/day)",
+        "warning_signs": "Swelling in legs or ankles, shortness of breath, decreased urine output, chest pain",
+        "follow_up_date": "2024-02-15",
+        "doctor": "Dr. Sarah Johnson"
+    }
+
+
+def write_roster(path: str, size: int, json_lines: bool):
+    """Write a synthetic roster without holding it in memory."""
+    rng = random.Random(size)
+    with open(path, 'w', encoding='utf-8') as f:
+        if not json_lines:
+            f.write("[\n")
+        for i in range(size):
+            record = json.dumps(synthetic_patient(i, rng), indent=None if json_lines else 2)
+            if json_lines:
+                f.write(record + "\n")
+            else:
+                f.write(("  " if i == 0 else ",\n  ") + record)
+        if not json_lines:
+            f.write("\n]\n")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(mode: str, path: str):
+    """Build the index in a fresh process and print a JSON result line."""
+    from tools.patient_store import JsonPatientRepository, normalize_id, normalize_name
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+
+    if mode == "json_load":
+        # Previous behavior: parse the whole file, then index the parsed objects
+        with open(path, 'r', encoding='utf-8') as f:
+            patients = json.load(f)
+        by_name = {}
+        by_id = {}
+        for patient in patients:
+            by_name.setdefault(normalize_name(patient["patient_name"]), []).append(patient)
+            by_id.setdefault(normalize_id(patient["patient_id"]), patient)
+        count = len(by_id)
+        lookup = lambda: by_id.get("P0000007")
+    elif mode == "sqlite":
+        from tools.patient_sqlite import SQLitePatientRepository, import_json_to_sqlite
+        db_path = path + ".db"
+        import_json_to_sqlite(path, db_path)
+        store = SQLitePatientRepository(db_path)
+        count = len(store)
+        lookup = lambda: store.find_by_id("P0000007")
+    else:
+        store = JsonPatientRepository(path)
+        store.refresh()
+        count = len(store)
+        lookup = lambda: store.find_by_id("P0000007")
+
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(10_000):
+        lookup()
+    lookup_us = (time.perf_counter() - start) / 10_000 * 1e6
+
+    print(json.dumps({
+        "mode": mode,
+        "records": count,
+        "build_s": round(build_seconds, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "delta_rss_mb": round(peak_rss_mb() - baseline, 1),
+        "lookup_us": round(lookup_us, 2)
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    print(f"{'records':>10} {'mode':>14} {'build s':>9} {'peak MB':>9} {'index MB':>9} {'lookup us':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            array_path = os.path.join(tmp, f"patients_{size}.json")
+            lines_path = os.path.join(tmp, f"patients_{size}.jsonl")
+            write_roster(array_path, size, json_lines=False)
+            write_roster(lines_path, size, json_lines=True)
+
+            for mode in args.modes:
+                path = lines_path if mode == "stream_jsonl" else array_path
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", mode, path],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                print(f"{result['records']:>10} {mode:>14} {result['build_s']:>9} "
+                      f"{result['peak_rss_mb']:>9} {result['delta_rss_mb']:>9} {result['lookup_us']:>10}")
+
+            for leftover in (array_path, lines_path, array_path + ".db"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+
+if __name__ == "__main__":
+    main()
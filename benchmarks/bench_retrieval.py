@@ -0,0 +1,109 @@
+"""
+Retrieval Quality Benchmark
+Recall@k and latency of dense, sparse (BM25) and hybrid retrieval on a fixed query set,
+optionally with cross-encoder reranking
+
+Each query is paired with a phrase found only in the chunks that answer it; a
+query counts as recalled at k if any of the top-k chunks contains the phrase.
+
+Usage:
+    python benchmarks/bench_retrieval.py
+    python benchmarks/bench_retrieval.py --chunk-size 300 --ks 1 2 3 5
+    python benchmarks/bench_retrieval.py --rerank
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.loader import EMBEDDING_MODEL_NAME, RETRIEVAL_MODES, NephrologyRAG, create_sample_nephrology_content
+
+# (query, phrase contained in the relevant chunk) over the sample nephrology guide
+QUERIES = [
+    ("Is tolvaptan used for kidney cysts?", "tolvaptan"),
+    ("What HbA1c target protects the kidneys in diabetes?", "HbA1c <7%"),
+    ("How much sodium can I have per day?", "Sodium: <2g per day"),
+    ("What is the potassium limit in advanced CKD?", "Potassium: Restrict to <2000mg/day"),
+    ("Can I take ibuprofen or naproxen?", "NSAIDs (ibuprofen, naproxen)"),
+    ("What GFR defines stage 4?", "Stage 4: GFR 15-29"),
+    ("How often is hemodialysis done?", "3 times per week"),
+    ("What does cloudy dialysate mean on peritoneal dialysis?", "cloudy dialysate"),
+    ("What blood pressure should I aim for?", "<130/80 mmHg"),
+    ("How much fluid should I drink to prevent kidney stones?", "2.5-3L/day"),
+    ("Which drugs need a dose change with kidney disease?", "Medications Requiring Dose Adjustment"),
+    ("How much weight gain in a day should make me call the doctor?", ">3 lbs in one day"),
+    ("What are signs of high potassium?", "hyperkalemia"),
+    ("Which blood pressure pills protect the kidneys?", "Lisinopril, enalapril, ramipril"),
+    ("Does contrast dye harm the kidneys?", "contrast-induced nephropathy"),
+    ("What protein intake is recommended before dialysis?", "0.6-0.8 g/kg/day"),
+    ("Which access is preferred for hemodialysis?", "Arteriovenous fistula"),
+    ("Can SGLT2 inhibitors slow kidney disease?", "SGLT2"),
+    ("What causes acute kidney injury?", "Dehydration, medications, obstruction, sepsis"),
+    ("How much phosphorus is allowed in stage 3 to 5?", "Phosphorus: <800-1000mg/day"),
+]
+
+
+def recall_at_k(rag: NephrologyRAG, mode: str, k: int, rerank: bool) -> float:
+    hits = 0
+    for query, phrase in QUERIES:
+        docs = rag.search(query, k=k, mode=mode, rerank=rerank)
+        hits += any(phrase.lower() in doc.page_content.lower() for doc in docs)
+    return hits / len(QUERIES)
+
+
+def latency_ms(rag: NephrologyRAG, mode: str, k: int, rerank: bool, repeats: int) -> list:
+    timings = []
+    for _ in range(repeats):
+        for query, _ in QUERIES:
+            rag._retrieval_cache.clear()
+            start = time.perf_counter()
+            rag.search(query, k=k, mode=mode, rerank=rerank)
+            timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def main():
+    from langchain.schema import Document
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    parser.add_argument("--chunk-size", type=int, default=400)
+    parser.add_argument("--chunk-overlap", type=int, default=50)
+    parser.add_argument("--ks", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--rerank", action="store_true", help="Also measure each mode with cross-encoder reranking")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rag = NephrologyRAG(
+            persist_directory=os.path.join(tmp, "chroma_db"),
+            embedding_cache_dir=None,
+            embedding_model_name=args.model
+        )
+        rag.create_vector_database(
+            [Document(page_content=create_sample_nephrology_content(), metadata={"source": "sample"})],
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap
+        )
+
+        print(f"\n{len(QUERIES)} queries, chunk size {args.chunk_size}, model {args.model}")
+        header = " ".join(f"{'R@' + str(k):>6}" for k in args.ks)
+        print(f"{'mode':<15} {header} {'p50 ms':>8} {'p95 ms':>8}")
+        for rerank in ([False, True] if args.rerank else [False]):
+            for mode in RETRIEVAL_MODES:
+                recalls = " ".join(f"{recall_at_k(rag, mode, k, rerank):>6.2f}" for k in args.ks)
+                timings = latency_ms(rag, mode, max(args.ks), rerank, args.repeats)
+                p95 = timings[int(len(timings) * 0.95) - 1]
+                label = f"{mode}+rerank" if rerank else mode
+                print(f"{label:<15} {recalls} {statistics.median(timings):>8.2f} {p95:>8.2f}")
+        if args.rerank:
+            print(f"\nReranker: {rag.reranker.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Intent Routing Benchmark
+Accuracy and per-message latency of the legacy substring scan and the IntentRouter on a labeled set
+
+Usage:
+    python benchmarks/bench_router.py
+    python benchmarks/bench_router.py --model sentence-transformers/all-MiniLM-L6-v2
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.router import CLINICAL, RECEPTIONIST, IntentRouter
+
+LABELED_MESSAGES = [
+    # Clinical questions
+    ("What should I eat?", CLINICAL),
+    ("I have swelling in my legs", CLINICAL),
+    ("When should I take my medications?", CLINICAL),
+    ("What are warning signs I should watch for?", CLINICAL),
+    ("Can I take ibuprofen for a headache?", CLINICAL),
+    ("How much water can I drink per day?", CLINICAL),
+    ("I can't eat anything since I got home", CLINICAL),
+    ("Is it normal to feel tired after dialysis?", CLINICAL),
+    ("My ankles look puffy today", CLINICAL),
+    ("My blood pressure is 160/100, is that bad?", CLINICAL),
+    ("Are bananas high in potassium?", CLINICAL),
+    ("I feel dizzy when I stand up", CLINICAL),
+    ("I have been vomiting since this morning", CLINICAL),
+    ("Why is my urine foamy?", CLINICAL),
+    ("Can I drink coffee with kidney disease?", CLINICAL),
+    ("What does creatinine mean?", CLINICAL),
+    ("I'm worried about the pain in my side", CLINICAL),
+    ("Should I exercise after my transplant?", CLINICAL),
+    ("My legs feel heavy and tight", CLINICAL),
+    ("I have a headache that won't go away", CLINICAL),
+    ("Is it safe to take my pills with food?", CLINICAL),
+    ("I have a fever and chills", CLINICAL),
+    ("How do I lower my sodium intake?", CLINICAL),
+    ("I'm short of breath at night", CLINICAL),
+    ("What happens if I miss a dose of furosemide?", CLINICAL),
+    ("My weight went up 3 kg in two days", CLINICAL),
+    ("Is itching a sign of kidney problems?", CLINICAL),
+    ("I'm John Smith and my feet are swollen", CLINICAL),
+    ("Why do I feel so weak all the time?", CLINICAL),
+    ("Can I have a glass of wine?", CLINICAL),
+    # Greetings or introductions with a symptom must reach the clinical agent
+    ("Hello, I have chest pain", CLINICAL),
+    ("Hi, I think I am having an emergency", CLINICAL),
+    ("Hello! I have a fever", CLINICAL),
+    ("My name is John Smith, I have swelling", CLINICAL),
+    ("Good morning, I feel dizzy", CLINICAL),
+    ("Hey, my ankles are swollen", CLINICAL),
+    ("Hi, thanks, but I'm still nauseous", CLINICAL),
+    # Receptionist messages
+    ("Hello", RECEPTIONIST),
+    ("Hi there!", RECEPTIONIST),
+    ("My name is John Smith", RECEPTIONIST),
+    ("I'm Maria Garcia", RECEPTIONIST),
+    ("Good morning", RECEPTIONIST),
+    ("Can I see my discharge summary?", RECEPTIONIST),
+    ("Can I get my discharge report please?", RECEPTIONIST),
+    ("My patient ID is P012", RECEPTIONIST),
+    ("Thanks for your help", RECEPTIONIST),
+    ("Bye", RECEPTIONIST),
+    ("Who are you?", RECEPTIONIST),
+    ("What can you do?", RECEPTIONIST),
+    ("Could you look me up? I'm Robert Brown", RECEPTIONIST),
+    ("Can I find my records here?", RECEPTIONIST),
+    ("I was discharged last week", RECEPTIONIST),
+    ("This is Emily Davis", RECEPTIONIST),
+    ("Thank you so much", RECEPTIONIST),
+    ("Can I talk to someone about my appointment?", RECEPTIONIST),
+    ("P021", RECEPTIONIST),
+    ("Hey, good afternoon", RECEPTIONIST),
+]
+
+
+def legacy_is_medical(message: str) -> bool:
+    """The substring scan previously used by MedicalAICrew._is_medical_question."""
+    medical_keywords = [
+        'symptom', 'pain', 'medication', 'medicine', 'treatment', 'side effect',
+        'swelling', 'kidney', 'dialysis', 'diet', 'food', 'eat', 'drink',
+        'blood pressure', 'diabetes', 'creatinine', 'protein', 'urine',
+        'should i', 'can i', 'is it normal', 'what if', 'how do i',
+        'concern', 'worried', 'advice', 'recommendation'
+    ]
+    message_lower = message.lower()
+    return any(keyword in message_lower for keyword in medical_keywords)
+
+
+def evaluate(name: str, is_medical, repeats: int):
+    correct = 0
+    misrouted = []
+    for message, label in LABELED_MESSAGES:
+        if (CLINICAL if is_medical(message) else RECEPTIONIST) == label:
+            correct += 1
+        else:
+            misrouted.append(message)
+
+    timings = []
+    for _ in range(repeats):
+        for message, _ in LABELED_MESSAGES:
+            start = time.perf_counter()
+            is_medical(message)
+            timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    accuracy = correct / len(LABELED_MESSAGES)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"{name:<18} {accuracy:>8.1%} {statistics.median(timings):>10.1f} {p99:>10.1f}")
+    for message in misrouted:
+        print(f"{'':<18} misrouted: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="sentence-transformers model for the embedding fallback")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{len(LABELED_MESSAGES)} labeled messages")
+    print(f"{'router':<18} {'accuracy':>8} {'p50 us':>10} {'p99 us':>10}")
+    evaluate("legacy substring", legacy_is_medical, args.repeats)
+    evaluate("regex", IntentRouter().is_medical, args.repeats)
+
+    if args.model:
+        from rag.embedding_cache import CachedEmbeddings
+        from rag.embedding_engine import BatchedEmbeddings
+
+        engine = BatchedEmbeddings(args.model)
+        router = IntentRouter(CachedEmbeddings(engine, model_name=engine.model_id, cache_dir=None))
+        evaluate("regex + embedding", router.is_medical, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
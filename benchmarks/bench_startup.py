@@ -0,0 +1,45 @@
+"""
+Cold Start Benchmark
+Startup-time breakdown of the staged, parallel system load used by the Streamlit app
+
+Run from the project root in a fresh process so imports are not already cached.
+The parallel load is compared with running the same stages one after another.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --serial
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.startup import StartupTimer, SystemLoader
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--serial", action="store_true", help="Run the stages one after another")
+    args = parser.parse_args()
+
+    timer = StartupTimer()
+    loader = SystemLoader(timer)
+    start = time.perf_counter()
+    if args.serial:
+        retriever = loader._load_knowledge_base()
+        crew = loader._load_crew()
+        with timer.stage("attach"):
+            crew.attach_knowledge_base(retriever)
+    else:
+        loader.start().wait()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'Serial' if args.serial else 'Parallel'} startup: {elapsed:.2f} s")
+    print(timer.report())
+
+
+if __name__ == "__main__":
+    main()
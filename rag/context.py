@@ -0,0 +1,172 @@
+"""
+Context Assembly
+Turns retrieved chunks into prompt context without splitter overlap or near-duplicates, within a token budget
+"""
+import os
+import re
+import threading
+from typing import List, Optional, Tuple
+
+from utils.tokens import TokenCounter, get_token_counter
+
+
+# Tokens of knowledge-base context per clinical prompt
+RAG_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "700"))
+
+# Chunks whose word sets overlap at least this much (Jaccard) with a kept chunk are dropped
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("RAG_NEAR_DUPLICATE_THRESHOLD", "0.8"))
+
+# Shared text between adjacent chunks shorter than this is left alone
+MIN_OVERLAP_CHARS = 20
+
+# Longest overlap searched for (the splitter's chunk_overlap is at most 200)
+MAX_OVERLAP_CHARS = 400
+
+# Chunks left with fewer tokens than this after trimming are dropped
+MIN_CHUNK_TOKENS = 20
+
+CHUNK_SEPARATOR = "\n\n"
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def overlap_length(first: str, second: str, max_chars: int = MAX_OVERLAP_CHARS) -> int:
+    """
+    Length of the longest suffix of first that is also a prefix of second.
+
+    Args:
+        first: Text that may end with the shared span
+        second: Text that may start with it
+        max_chars: Longest span considered
+
+    Returns:
+        Span length in characters (0 if shorter than MIN_OVERLAP_CHARS)
+    """
+    tail = first[-max_chars:]
+    probe = second[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return 0
+    # Candidate starts are occurrences of second's opening characters in first's tail
+    start = tail.find(probe)
+    while start != -1:
+        if second.startswith(tail[start:]):
+            return len(tail) - start
+        start = tail.find(probe, start + 1)
+    return 0
+
+
+def word_set(text: str) -> frozenset:
+    return frozenset(WORD_PATTERN.findall(text.lower()))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ContextAssembler:
+    """Builds the knowledge-base context of a prompt and tracks the tokens it saves"""
+
+    def __init__(
+        self,
+        token_budget: int = RAG_CONTEXT_TOKENS,
+        counter: Optional[TokenCounter] = None,
+        near_duplicate_threshold: float = NEAR_DUPLICATE_THRESHOLD
+    ):
+        """
+        Initialize the assembler.
+
+        Args:
+            token_budget: Maximum tokens of assembled context
+            counter: Token counter (default: PROMPT_TOKENIZER, or the heuristic estimate)
+            near_duplicate_threshold: Jaccard similarity above which a chunk is dropped
+        """
+        self.token_budget = token_budget
+        self.counter = counter or get_token_counter()
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "raw_tokens": 0, "tokens": 0, "overlaps_removed": 0,
+                       "duplicates_dropped": 0, "chunks_truncated": 0}
+
+    def assemble(self, docs: List) -> Tuple[str, dict]:
+        """
+        Assemble retrieved chunks, best first, into prompt context.
+
+        Text a chunk shares with an earlier chunk of the same source (the
+        splitter's overlap) is cut from it, chunks that are near-duplicates of
+        a kept chunk are dropped, and chunks are added until the token budget
+        is reached, truncating the last one to fit.
+
+        Args:
+            docs: Retrieved documents in rank order
+
+        Returns:
+            The context and a report with raw and assembled token counts
+        """
+        report = {"chunks": len(docs), "kept": 0, "overlaps_removed": 0, "duplicates_dropped": 0, "truncated": 0}
+        kept: List[Tuple[Optional[str], str, frozenset]] = []
+        parts: List[str] = []
+        used = 0
+
+        for doc in docs:
+            source = doc.metadata.get("source")
+            text = doc.page_content.strip()
+
+            # Cut splitter overlap with earlier chunks of the same source
+            for kept_source, kept_text, _ in kept:
+                if kept_source != source:
+                    continue
+                head = overlap_length(kept_text, text)
+                if head:
+                    text = text[head:].lstrip()
+                    report["overlaps_removed"] += 1
+                tail = overlap_length(text, kept_text)
+                if tail:
+                    text = text[:-tail].rstrip()
+                    report["overlaps_removed"] += 1
+
+            words = word_set(text)
+            if not words or any(jaccard(words, kept_words) >= self.near_duplicate_threshold for _, _, kept_words in kept):
+                report["duplicates_dropped"] += 1
+                continue
+
+            remaining = self.token_budget - used - (self.counter.count(CHUNK_SEPARATOR) if parts else 0)
+            if remaining < MIN_CHUNK_TOKENS:
+                break
+            tokens = self.counter.count(text)
+            if tokens > remaining:
+                text = self.counter.truncate(text, remaining)
+                tokens = self.counter.count(text)
+                report["truncated"] += 1
+                if tokens < MIN_CHUNK_TOKENS:
+                    break
+
+            kept.append((source, doc.page_content.strip(), words))
+            parts.append(text)
+            used += tokens + (self.counter.count(CHUNK_SEPARATOR) if len(parts) > 1 else 0)
+
+        context = CHUNK_SEPARATOR.join(parts)
+        report["kept"] = len(parts)
+        report["raw_tokens"] = self.counter.count(CHUNK_SEPARATOR.join(doc.page_content for doc in docs))
+        report["tokens"] = self.counter.count(context)
+        report["tokens_saved"] = report["raw_tokens"] - report["tokens"]
+
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["raw_tokens"] += report["raw_tokens"]
+            self._stats["tokens"] += report["tokens"]
+            self._stats["overlaps_removed"] += report["overlaps_removed"]
+            self._stats["duplicates_dropped"] += report["duplicates_dropped"]
+            self._stats["chunks_truncated"] += report["truncated"]
+        return context, report
+
+    def stats(self) -> dict:
+        """Return totals across requests, including tokens saved."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["tokens_saved"] = stats["raw_tokens"] - stats["tokens"]
+        stats["saved_ratio"] = round(stats["tokens_saved"] / stats["raw_tokens"], 4) if stats["raw_tokens"] else 0.0
+        stats["token_budget"] = self.token_budget
+        stats["counter"] = self.counter.name
+        return stats
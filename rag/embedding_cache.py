@@ -0,0 +1,142 @@
+"""
+Persistent Embedding Cache
+Content-addressed on-disk store so unchanged chunks are never re-embedded
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from utils.cache import LRUCache
+
+
+DEFAULT_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "embedding_cache")
+
+# In-memory cache of query embeddings
+QUERY_CACHE_SIZE = int(os.getenv("RAG_QUERY_CACHE_SIZE", "512"))
+
+# Keys per SELECT ... IN (...) query, kept below SQLite's variable limit
+LOOKUP_BATCH_SIZE = 500
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a query for cache lookups.
+
+    Only case and whitespace are folded: the MiniLM tokenizer is uncased and
+    ignores extra whitespace, so normalized queries embed identically.
+    """
+    return " ".join(text.casefold().split())
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Content address of a chunk embedding: SHA-256 of model name and text."""
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that stores document vectors on disk by content hash"""
+
+    def __init__(self, underlying: Embeddings, model_name: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        """
+        Initialize the cache.
+
+        Args:
+            underlying: Embedding model used for texts not in the cache
+            model_name: Model identifier, part of every cache key
+            cache_dir: Directory holding the cache database (None disables persistence)
+        """
+        self.underlying = underlying
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        self.query_cache = LRUCache(maxsize=QUERY_CACHE_SIZE)
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(
+                os.path.join(cache_dir, "embeddings.db"),
+                check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Fetch cached vectors for the given keys."""
+        found = {}
+        if self._conn is None:
+            return found
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                )
+                for key, blob in rows:
+                    found[key] = array('f', blob).tolist()
+        return found
+
+    def _store(self, vectors: Dict[str, List[float]]):
+        """Persist newly computed vectors as float32 blobs."""
+        if self._conn is None or not vectors:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array('f', vector).tobytes()) for key, vector in vectors.items()]
+            )
+            self._conn.commit()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, computing only those whose text is not cached.
+
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            One vector per input text, in input order
+        """
+        keys = [embedding_key(self.model_name, text) for text in texts]
+        vectors = self._lookup(list(set(keys)))
+
+        # Embed each missing distinct text once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+
+        self.hits += len(texts) - sum(1 for key in keys if key in missing)
+        self.misses += len(missing)
+
+        if missing:
+            computed = self.underlying.embed_documents(list(missing.values()))
+            new_vectors = dict(zip(missing.keys(), computed))
+            self._store(new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, reusing the vector of a recent identical query (kept in memory only)."""
+        key = normalize_query(text)
+        vector = self.query_cache.get(key)
+        if vector is None:
+            vector = self.underlying.embed_query(text)
+            self.query_cache.set(key, vector)
+        return vector
+
+    def stats(self) -> dict:
+        """Return cache hit/miss counters for documents and queries."""
+        return {"hits": self.hits, "misses": self.misses, "queries": self.query_cache.stats()}
@@ -0,0 +1,96 @@
+"""
+Embedding Model Registry
+One shared embedding model per process, or a sidecar shared by several worker processes
+"""
+import os
+import threading
+from typing import Dict, Hashable, List
+
+from langchain_core.embeddings import Embeddings
+
+from rag.embedding_engine import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_QUANTIZE,
+    EMBEDDING_THREADS,
+    BatchedEmbeddings,
+)
+
+
+# Unix socket of a running rag/embedding_server.py; empty loads the model in-process
+EMBEDDING_SIDECAR_SOCKET = os.getenv("EMBEDDING_SIDECAR_SOCKET", "")
+
+_engines: Dict[Hashable, Embeddings] = {}
+_engine_locks: Dict[Hashable, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def get_embedding_engine(
+    model_name: str,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    num_threads: int = EMBEDDING_THREADS,
+    quantize: bool = EMBEDDING_QUANTIZE,
+    device: str = "cpu",
+    sidecar_socket: str = EMBEDDING_SIDECAR_SOCKET
+) -> Embeddings:
+    """
+    Get the process-wide embedding engine for a model, loading it on first use.
+
+    Every NephrologyRAG (and anything else embedding with the same settings)
+    shares one copy of the weights. With a sidecar socket configured, the
+    engine is a client of the sidecar instead, so worker processes share a
+    single copy; if the sidecar is unreachable the model is loaded in-process.
+
+    Args:
+        model_name: sentence-transformers model name
+        batch_size: Texts per forward pass
+        num_threads: torch intra-op threads (0 keeps the default)
+        quantize: Apply dynamic int8 quantization to Linear layers
+        device: torch device
+        sidecar_socket: Unix socket of an embedding sidecar ("" for none)
+
+    Returns:
+        Embeddings with a model_id attribute
+    """
+    key = (model_name, batch_size, num_threads, quantize, device, sidecar_socket)
+    engine = _engines.get(key)
+    if engine is not None:
+        return engine
+
+    # Per-model lock so loading one model does not block lookups of another
+    with _registry_lock:
+        lock = _engine_locks.setdefault(key, threading.Lock())
+    with lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _create_engine(model_name, batch_size, num_threads, quantize, device, sidecar_socket)
+            _engines[key] = engine
+    return engine
+
+
+def _create_engine(model_name, batch_size, num_threads, quantize, device, sidecar_socket) -> Embeddings:
+    """Connect to the sidecar if configured, otherwise load the model."""
+    if sidecar_socket:
+        from rag.embedding_server import SidecarEmbeddings
+
+        try:
+            engine = SidecarEmbeddings(sidecar_socket)
+            expected = f"{model_name}+int8" if quantize else model_name
+            if engine.model_id != expected:
+                raise ValueError(f"sidecar serves {engine.model_id}, expected {expected}")
+            print(f"Using embedding sidecar at {sidecar_socket} ({engine.model_id})")
+            return engine
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Embedding sidecar unavailable ({e}); loading {model_name} in-process")
+
+    return BatchedEmbeddings(
+        model_name=model_name,
+        batch_size=batch_size,
+        num_threads=num_threads,
+        quantize=quantize,
+        device=device
+    )
+
+
+def loaded_engines() -> List[dict]:
+    """Return the model id and type (in-process or sidecar client) of each loaded engine."""
+    return [{"model_id": engine.model_id, "type": type(engine).__name__} for engine in list(_engines.values())]
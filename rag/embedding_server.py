@@ -0,0 +1,203 @@
+"""
+Embedding Sidecar
+Serves one embedding model over a Unix socket so several worker processes share its weights
+
+Usage:
+    python rag/embedding_server.py --socket /tmp/nephrology-embeddings.sock
+    EMBEDDING_SIDECAR_SOCKET=/tmp/nephrology-embeddings.sock streamlit run app_streamlit.py
+
+Messages in both directions are a 4-byte big-endian length followed by JSON.
+Vectors travel as base64-encoded float32 arrays.
+"""
+import argparse
+import base64
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Add project root to path so this module can also be run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.embedding_engine import EMBEDDING_MODEL_NAME, EMBEDDING_QUANTIZE
+from rag.embedding_registry import get_embedding_engine
+
+
+HEADER = struct.Struct(">I")
+
+# Largest accepted message, guarding against a corrupt length header
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+SIDECAR_TIMEOUT = float(os.getenv("EMBEDDING_SIDECAR_TIMEOUT", "60"))
+
+
+def send_message(sock: socket.socket, payload: dict):
+    """Send one length-prefixed JSON message."""
+    data = json.dumps(payload).encode("utf-8")
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks, remaining = [], size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> dict:
+    """Receive one length-prefixed JSON message."""
+    (size,) = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    if size > MAX_MESSAGE_BYTES:
+        raise ConnectionError(f"message of {size} bytes exceeds the limit")
+    return json.loads(_recv_exact(sock, size))
+
+
+def encode_vectors(vectors: List[List[float]]) -> dict:
+    array = np.asarray(vectors, dtype=np.float32)
+    return {"shape": list(array.shape), "vectors": base64.b64encode(array.tobytes()).decode("ascii")}
+
+
+def decode_vectors(payload: dict) -> List[List[float]]:
+    array = np.frombuffer(base64.b64decode(payload["vectors"]), dtype=np.float32)
+    return array.reshape(payload["shape"]).tolist()
+
+
+class SidecarEmbeddings(Embeddings):
+    """Embeddings computed by an embedding sidecar"""
+
+    def __init__(self, socket_path: str, timeout: float = SIDECAR_TIMEOUT):
+        """
+        Connect to the sidecar.
+
+        Args:
+            socket_path: Unix socket the sidecar listens on
+            timeout: Seconds to wait for a response
+
+        Raises:
+            OSError: If the sidecar is not reachable
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self.model_id = self._request({"op": "info"})["model_id"]
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+    def _request(self, payload: dict) -> dict:
+        """Send a request on this thread's connection, reconnecting once if it was dropped."""
+        while True:
+            sock = getattr(self._local, "sock", None)
+            reused = sock is not None
+            try:
+                if sock is None:
+                    sock = self._local.sock = self._connect()
+                send_message(sock, payload)
+                response = recv_message(sock)
+                break
+            except OSError as e:
+                if sock is not None:
+                    sock.close()
+                self._local.sock = None
+                # Only a kept-alive connection the sidecar closed (e.g. on restart) is retried.
+                # A timeout is not: the sidecar may still be working on the request.
+                if not reused or not isinstance(e, ConnectionError):
+                    raise
+        if "error" in response:
+            raise RuntimeError(f"Embedding sidecar error: {response['error']}")
+        return response
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return decode_vectors(self._request({"op": "embed_documents", "texts": texts}))
+
+    def embed_query(self, text: str) -> List[float]:
+        return decode_vectors(self._request({"op": "embed_query", "text": text}))[0]
+
+
+class EmbeddingRequestHandler(socketserver.BaseRequestHandler):
+    """Answers requests on one client connection until it closes"""
+
+    def handle(self):
+        engine = self.server.engine
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+            try:
+                op = request.get("op")
+                if op == "info":
+                    response = {"model_id": engine.model_id}
+                else:
+                    # One forward pass at a time; torch already spreads each pass across cores
+                    with self.server.encode_lock:
+                        if op == "embed_documents":
+                            response = encode_vectors(engine.embed_documents(request["texts"]))
+                        elif op == "embed_query":
+                            response = encode_vectors([engine.embed_query(request["text"])])
+                        else:
+                            response = {"error": f"unknown op {op!r}"}
+            except Exception as e:
+                response = {"error": str(e)}
+            try:
+                send_message(self.request, response)
+            except OSError:
+                return
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix-socket server holding one embedding model"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, engine: Embeddings):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        # Only processes of the same user (and group) may connect; the socket is created
+        # with these permissions, so there is no window in which others can connect
+        umask = os.umask(0o117)
+        try:
+            super().__init__(socket_path, EmbeddingRequestHandler)
+        finally:
+            os.umask(umask)
+        self.engine = engine
+        self.encode_lock = threading.Lock()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=os.getenv("EMBEDDING_SIDECAR_SOCKET") or "/tmp/nephrology-embeddings.sock")
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    parser.add_argument("--quantize", action="store_true", default=EMBEDDING_QUANTIZE)
+    args = parser.parse_args()
+
+    engine = get_embedding_engine(args.model, quantize=args.quantize, sidecar_socket="")
+    server = EmbeddingServer(args.socket, engine)
+    print(f"✅ Serving {engine.model_id} on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
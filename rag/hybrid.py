@@ -0,0 +1,74 @@
+"""
+Hybrid Retrieval
+Sparse BM25 index over the vector store's chunks and reciprocal-rank fusion with dense results
+"""
+import os
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from utils.bm25 import BM25Index
+
+
+# Reciprocal-rank fusion constant; larger values flatten the advantage of top ranks
+RRF_K = int(os.getenv("RAG_RRF_K", "60"))
+
+
+def chunk_key(doc: Document) -> Hashable:
+    """Identity of a chunk across rankings (dense results carry no Chroma ids)."""
+    return (doc.metadata.get("source"), doc.page_content)
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = RRF_K,
+    weights: Optional[Sequence[float]] = None
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse rankings by summing weight / (k + rank) per item.
+
+    Args:
+        rankings: Ranked item keys, best first, one list per retriever
+        k: RRF constant
+        weights: Optional weight per ranking (default 1.0 each)
+
+    Returns:
+        (key, fused score) pairs, best first
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, key in enumerate(ranking, 1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class SparseChunkIndex:
+    """BM25 index over the chunks stored in a Chroma collection"""
+
+    def __init__(self, texts: List[str], metadatas: List[Optional[dict]]):
+        """
+        Build the index.
+
+        Args:
+            texts: Chunk texts
+            metadatas: Chunk metadata, aligned with texts
+        """
+        self.documents = [
+            Document(page_content=text, metadata=metadata or {})
+            for text, metadata in zip(texts, metadatas)
+        ]
+        self._index = BM25Index(texts)
+
+    @classmethod
+    def from_vectorstore(cls, vectorstore) -> "SparseChunkIndex":
+        """Build the index from every chunk in a Chroma vector store."""
+        data = vectorstore.get(include=["documents", "metadatas"])
+        return cls(data["documents"], data["metadatas"])
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def search(self, query: str, k: int = 10) -> List[Document]:
+        """Return the k best BM25 matches."""
+        return [self.documents[position] for position, _ in self._index.search(query, k)]
@@ -0,0 +1,106 @@
+"""
+Parallel PDF Ingestion
+Parses and splits reference PDFs across processes and streams the chunks in bounded batches
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from langchain_community.document_loaders import PyPDFLoader
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+
+# Worker processes used to parse PDFs (defaults to all cores)
+INGEST_WORKERS = int(os.getenv("RAG_INGEST_WORKERS", "0")) or os.cpu_count() or 1
+
+# Chunks embedded and written to the vector store per batch
+INGEST_BATCH_SIZE = int(os.getenv("RAG_INGEST_BATCH_SIZE", "256"))
+
+
+def create_text_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """Text splitter shared by every ingestion path."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=["\n\n", "\n", " ", ""]
+    )
+
+
+def load_and_split_pdf(path: str, chunk_size: int, chunk_overlap: int) -> Tuple[str, List]:
+    """
+    Parse one PDF page by page and split each page as it is read.
+
+    Runs inside a worker process, so it must stay a module-level function.
+
+    Args:
+        path: Path to the PDF file
+        chunk_size: Size of text chunks
+        chunk_overlap: Overlap between chunks
+
+    Returns:
+        (path, list of chunk documents)
+    """
+    splitter = create_text_splitter(chunk_size, chunk_overlap)
+    chunks = []
+    for page in PyPDFLoader(path).lazy_load():
+        chunks.extend(splitter.split_documents([page]))
+    return path, chunks
+
+
+def iter_split_pdfs(
+    paths: List[str],
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    workers: Optional[int] = None
+) -> Iterator[Tuple[str, List]]:
+    """
+    Parse and split PDFs in parallel, yielding each file's chunks as soon as it is done.
+
+    At most two files per worker are in flight, so memory is bounded by the
+    largest few PDFs rather than by the whole corpus. Files are yielded in
+    completion order.
+
+    Args:
+        paths: PDF files to process
+        chunk_size: Size of text chunks
+        chunk_overlap: Overlap between chunks
+        workers: Number of worker processes (defaults to RAG_INGEST_WORKERS)
+
+    Yields:
+        (path, list of chunk documents)
+    """
+    workers = min(workers or INGEST_WORKERS, len(paths))
+    if workers <= 1:
+        for path in paths:
+            yield load_and_split_pdf(path, chunk_size, chunk_overlap)
+        return
+
+    max_pending = workers * 2
+    remaining = iter(paths)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for path in remaining:
+            pending.add(executor.submit(load_and_split_pdf, path, chunk_size, chunk_overlap))
+            if len(pending) >= max_pending:
+                break
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.add(executor.submit(load_and_split_pdf, next_path, chunk_size, chunk_overlap))
+
+
+def iter_batches(items: Iterable, batch_size: int = INGEST_BATCH_SIZE) -> Iterator[List]:
+    """Group an iterable into lists of at most batch_size items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -2,30 +2,118 @@
 RAG (Retrieval-Augmented Generation) Loader
 Processes nephrology reference materials and creates vector database
 """
+import hashlib
+import json
 import os
-from typing import Optional, List
+import sys
+import threading
+import time
+from typing import Dict, Optional, List
+
+# Add project root to path so the loader can also be run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from langchain.document_loaders import PyPDFLoader, DirectoryLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
 
+from rag.embedding_cache import CachedEmbeddings, DEFAULT_CACHE_DIR, normalize_query
+from rag.embedding_engine import EMBEDDING_MODEL_NAME
+from rag.embedding_registry import get_embedding_engine
+from rag.hybrid import SparseChunkIndex, chunk_key, reciprocal_rank_fusion
+from rag.ingest import INGEST_BATCH_SIZE, create_text_splitter, iter_batches, iter_split_pdfs
+from rag.reranker import RAG_RERANK, RERANK_CANDIDATES, CrossEncoderReranker
+from rag.retriever import NephrologyRetriever
+from utils.cache import LRUCache
+
+
+# Sync the vector database with the PDF directory instead of rebuilding it
+RAG_INCREMENTAL_SYNC = os.getenv("RAG_INCREMENTAL_SYNC", "True").lower() == "true"
+
+MANIFEST_FILENAME = "manifest.json"
+
+# Top-k results cached per normalized query, dropped when the index changes
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RAG_QUERY_CACHE_SIZE", "512"))
+RETRIEVAL_CACHE_TTL = float(os.getenv("RAG_QUERY_CACHE_TTL", "3600"))
+
+# "hybrid" fuses BM25 and vector rankings; "dense" and "sparse" use one of them
+RETRIEVAL_MODES = ("hybrid", "dense", "sparse")
+RAG_RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "hybrid").lower()
+
+# Candidates fetched from each ranking before fusion
+HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", "20"))
+
+
+def file_sha256(path: str) -> str:
+    """Hash a file's contents without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def find_pdf_files(directory_path: str) -> Dict[str, str]:
+    """
+    Find PDFs under a directory.
+
+    Returns:
+        Mapping of path relative to directory_path -> full path
+    """
+    pdf_files = {}
+    for root, _, files in os.walk(directory_path):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                path = os.path.join(root, name)
+                pdf_files[os.path.relpath(path, directory_path)] = path
+    return pdf_files
+
 
 class NephrologyRAG:
     """RAG system for nephrology knowledge base"""
     
-    def __init__(self, persist_directory: str = "chroma_db"):
+    def __init__(
+        self,
+        persist_directory: str = "chroma_db",
+        embedding_cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        embedding_model_name: str = EMBEDDING_MODEL_NAME,
+        retrieval_mode: str = RAG_RETRIEVAL_MODE,
+        rerank: bool = RAG_RERANK
+    ):
         """
         Initialize the RAG system.
         
         Args:
             persist_directory: Directory to store the vector database
+            embedding_cache_dir: Directory for the persistent chunk embedding cache
+                (kept outside persist_directory so it survives rebuilds; None disables it)
+            embedding_model_name: sentence-transformers model for chunk and query embeddings
+            retrieval_mode: "hybrid" (BM25 + vector, fused), "dense" or "sparse"
+            rerank: Rerank over-fetched candidates with a CPU cross-encoder
         """
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{retrieval_mode}'; expected one of {RETRIEVAL_MODES}")
         self.persist_directory = persist_directory
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={'device': 'cpu'}
+        self.retrieval_mode = retrieval_mode
+        # Shared by every instance in the process (or served by the embedding sidecar)
+        engine = get_embedding_engine(embedding_model_name, device='cpu')
+        self.embeddings = CachedEmbeddings(
+            engine,
+            model_name=engine.model_id,
+            cache_dir=embedding_cache_dir
         )
         self.vectorstore = None
+        self.reranker = CrossEncoderReranker() if rerank else None
+        
+        # Incremented whenever the indexed content changes; part of every retrieval cache key
+        self.index_version = 0
+        self._retrieval_cache = LRUCache(maxsize=RETRIEVAL_CACHE_SIZE, ttl=RETRIEVAL_CACHE_TTL)
+        self._search_misses = 0
+        self._search_miss_seconds = 0.0
+        
+        # BM25 index over the stored chunks, rebuilt lazily after index changes
+        self._sparse_index = None
+        self._sparse_index_version = None
+        self._sparse_index_lock = threading.Lock()
         
     def load_documents_from_pdf(self, pdf_path: str) -> List:
         """
@@ -73,23 +161,194 @@ class NephrologyRAG:
             chunk_overlap: Overlap between chunks
         """
         print("Splitting documents into chunks...")
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""]
-        )
-        texts = text_splitter.split_documents(documents)
+        texts = self._split_documents(documents, chunk_size, chunk_overlap)
         print(f"Created {len(texts)} text chunks")
         
+        # Chunks built here have no manifest entry, so a later sync must start over
+        if os.path.exists(self._manifest_path()):
+            os.remove(self._manifest_path())
+        
         print("Creating vector embeddings and storing in ChromaDB...")
+        hits_before, misses_before = self.embeddings.hits, self.embeddings.misses
         self.vectorstore = Chroma.from_documents(
             documents=texts,
             embedding=self.embeddings,
             persist_directory=self.persist_directory
         )
+        print(
+            f"Embedding cache: {self.embeddings.hits - hits_before} chunks reused, "
+            f"{self.embeddings.misses - misses_before} newly embedded"
+        )
+        self._mark_index_changed()
         print(f"Vector database created and persisted to {self.persist_directory}")
     
+    def _split_documents(self, documents: List, chunk_size: int, chunk_overlap: int) -> List:
+        """Split documents into overlapping text chunks."""
+        return create_text_splitter(chunk_size, chunk_overlap).split_documents(documents)
+    
+    def index_pdf_files(
+        self,
+        pdf_paths: List[str],
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        workers: Optional[int] = None,
+        batch_size: int = INGEST_BATCH_SIZE
+    ) -> int:
+        """
+        Build the vector database from PDFs with the parallel ingestion pipeline.
+        
+        PDFs are parsed and split in worker processes while the main process
+        embeds and stores finished chunks batch_size at a time, so the corpus
+        is never held in memory as a whole.
+        
+        Args:
+            pdf_paths: PDF files to index
+            chunk_size: Size of text chunks
+            chunk_overlap: Overlap between chunks
+            workers: Parser processes (defaults to RAG_INGEST_WORKERS)
+            batch_size: Chunks embedded per vector store write
+            
+        Returns:
+            Number of chunks indexed
+        """
+        if os.path.exists(self._manifest_path()):
+            os.remove(self._manifest_path())
+        if self.vectorstore is None:
+            self.vectorstore = Chroma(
+                persist_directory=self.persist_directory,
+                embedding_function=self.embeddings
+            )
+        
+        print(f"Indexing {len(pdf_paths)} PDF file(s)...")
+        chunks = (
+            chunk
+            for path, file_chunks in iter_split_pdfs(pdf_paths, chunk_size, chunk_overlap, workers)
+            for chunk in file_chunks
+        )
+        total = 0
+        for batch in iter_batches(chunks, batch_size):
+            self.vectorstore.add_documents(batch)
+            total += len(batch)
+        self._mark_index_changed()
+        print(f"Indexed {total} text chunks into {self.persist_directory}")
+        return total
+    
+    def _manifest_path(self) -> str:
+        return os.path.join(self.persist_directory, MANIFEST_FILENAME)
+    
+    def _load_manifest(self) -> dict:
+        """Load the sync manifest, or an empty one if missing or unreadable."""
+        try:
+            with open(self._manifest_path(), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _save_manifest(self, manifest: dict):
+        """Write the sync manifest atomically."""
+        os.makedirs(self.persist_directory, exist_ok=True)
+        tmp_path = self._manifest_path() + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self._manifest_path())
+    
+    def sync_directory(
+        self,
+        directory_path: str,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        rebuild: bool = False
+    ) -> dict:
+        """
+        Bring the vector database in line with the PDFs in a directory.
+        
+        A manifest in persist_directory records each file's SHA-256 and the
+        IDs of its chunks. New or changed files are parsed, split and upserted;
+        chunks of changed or removed files are deleted. Unchanged files are not
+        opened beyond hashing, so the cost follows the size of the change.
+        Changed files are parsed in parallel by the ingestion pipeline.
+
+        Args:
+            directory_path: Directory containing PDFs (searched recursively)
+            chunk_size: Size of text chunks
+            chunk_overlap: Overlap between chunks
+            rebuild: Drop the existing collection and re-index every file
+            
+        Returns:
+            Counts of added, updated, removed and unchanged files
+        """
+        settings = {
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "embedding_model": self.embeddings.model_name
+        }
+        manifest = self._load_manifest()
+        
+        if rebuild or manifest.get("settings") != settings:
+            # Chunks not tracked by this manifest cannot be removed one by one
+            if os.path.exists(self.persist_directory):
+                print("Dropping existing vector database and re-indexing all files...")
+                self.load_existing_database()
+                self.vectorstore.delete_collection()
+            manifest = {"settings": settings, "files": {}}
+            self.vectorstore = None
+            self._mark_index_changed()
+        
+        if self.vectorstore is None:
+            self.vectorstore = Chroma(
+                persist_directory=self.persist_directory,
+                embedding_function=self.embeddings
+            )
+        
+        tracked = manifest["files"]
+        current = find_pdf_files(directory_path)
+        summary = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        
+        for rel_path in sorted(set(tracked) - set(current)):
+            print(f"Removing chunks for deleted file: {rel_path}")
+            if tracked[rel_path]["chunk_ids"]:
+                self.vectorstore.delete(ids=tracked[rel_path]["chunk_ids"])
+            del tracked[rel_path]
+            summary["removed"] += 1
+            self._save_manifest(manifest)
+        
+        changed = {}
+        for rel_path, path in sorted(current.items()):
+            digest = file_sha256(path)
+            entry = tracked.get(rel_path)
+            if entry and entry["sha256"] == digest:
+                summary["unchanged"] += 1
+            else:
+                changed[path] = (rel_path, digest)
+        
+        for path, chunks in iter_split_pdfs(list(changed), chunk_size, chunk_overlap):
+            rel_path, digest = changed[path]
+            entry = tracked.get(rel_path)
+            path_key = hashlib.sha256(rel_path.encode("utf-8")).hexdigest()[:12]
+            chunk_ids = [f"{path_key}-{digest[:12]}-{i}" for i in range(len(chunks))]
+            print(f"Indexing {rel_path}: {len(chunks)} chunks")
+            
+            if entry and entry["chunk_ids"]:
+                self.vectorstore.delete(ids=entry["chunk_ids"])
+            for start in range(0, len(chunks), INGEST_BATCH_SIZE):
+                self.vectorstore.add_documents(
+                    chunks[start:start + INGEST_BATCH_SIZE],
+                    ids=chunk_ids[start:start + INGEST_BATCH_SIZE]
+                )
+            
+            tracked[rel_path] = {"sha256": digest, "chunk_ids": chunk_ids}
+            summary["updated" if entry else "added"] += 1
+            self._save_manifest(manifest)
+        
+        self._save_manifest(manifest)
+        if summary["added"] or summary["updated"] or summary["removed"]:
+            self._mark_index_changed()
+        print(
+            f"Sync complete: {summary['added']} added, {summary['updated']} updated, "
+            f"{summary['removed']} removed, {summary['unchanged']} unchanged"
+        )
+        return summary
+    
     def load_existing_database(self):
         """Load an existing vector database."""
         if os.path.exists(self.persist_directory):
@@ -98,6 +357,7 @@ class NephrologyRAG:
                 persist_directory=self.persist_directory,
                 embedding_function=self.embeddings
             )
+            self._mark_index_changed()
             print("Vector database loaded successfully")
             return True
         else:
@@ -118,10 +378,102 @@ class NephrologyRAG:
             if not self.load_existing_database():
                 raise ValueError("No vector database available. Please create one first.")
         
-        return self.vectorstore.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": k}
-        )
+        return NephrologyRetriever(rag=self, k=k)
+    
+    def _mark_index_changed(self):
+        """Bump the index version and drop cached retrieval results."""
+        self.index_version += 1
+        self._retrieval_cache.clear()
+    
+    def search(self, query: str, k: int = 3, mode: Optional[str] = None, rerank: Optional[bool] = None) -> List:
+        """
+        Retrieve chunks for a query, with a per-query result cache.
+        
+        Results are cached by normalized query, k, mode, reranking and index
+        version, and expire after RAG_QUERY_CACHE_TTL seconds.
+        
+        Args:
+            query: Search query
+            k: Number of results to return
+            mode: "hybrid", "dense" or "sparse" (defaults to the instance's retrieval mode)
+            rerank: Rerank with the cross-encoder (defaults to whether the instance has one)
+            
+        Returns:
+            List of matching documents
+        """
+        mode = mode or self.retrieval_mode
+        if rerank is None:
+            rerank = self.reranker is not None
+        elif rerank and self.reranker is None:
+            self.reranker = CrossEncoderReranker()
+        if self.vectorstore is None:
+            if not self.load_existing_database():
+                raise ValueError("No vector database available. Please create one first.")
+        
+        key = (normalize_query(query), k, mode, rerank, self.index_version)
+        docs = self._retrieval_cache.get(key)
+        if docs is None:
+            start = time.perf_counter()
+            # Over-fetch so the cross-encoder can promote chunks ranked below k
+            fetch_k = max(k, RERANK_CANDIDATES) if rerank else k
+            if mode == "dense":
+                docs = self.vectorstore.similarity_search(query, k=fetch_k)
+            elif mode == "sparse":
+                docs = self._get_sparse_index().search(query, fetch_k)
+            else:
+                docs = self._hybrid_search(query, fetch_k)
+            if rerank:
+                docs, _ = self.reranker.rerank(query, docs, k)
+            self._search_miss_seconds += time.perf_counter() - start
+            self._search_misses += 1
+            self._retrieval_cache.set(key, docs)
+        return list(docs)
+    
+    def _get_sparse_index(self) -> SparseChunkIndex:
+        """Return the BM25 index of the stored chunks, rebuilding it if the index changed."""
+        with self._sparse_index_lock:
+            if self._sparse_index is None or self._sparse_index_version != self.index_version:
+                version = self.index_version
+                self._sparse_index = SparseChunkIndex.from_vectorstore(self.vectorstore)
+                self._sparse_index_version = version
+            return self._sparse_index
+    
+    def _hybrid_search(self, query: str, k: int) -> List:
+        """
+        Fuse BM25 and vector rankings with reciprocal-rank fusion.
+        
+        BM25 finds exact terms embeddings blur (drug names, lab thresholds),
+        while vector search finds paraphrases; fusing both lifts recall at
+        small k.
+        """
+        candidates = max(k, HYBRID_CANDIDATES)
+        dense = self.vectorstore.similarity_search(query, k=candidates)
+        sparse = self._get_sparse_index().search(query, candidates)
+        
+        docs_by_key = {}
+        for doc in dense + sparse:
+            docs_by_key.setdefault(chunk_key(doc), doc)
+        fused = reciprocal_rank_fusion([
+            [chunk_key(doc) for doc in dense],
+            [chunk_key(doc) for doc in sparse]
+        ])
+        return [docs_by_key[key] for key, _ in fused[:k]]
+    
+    def retrieval_cache_stats(self) -> dict:
+        """
+        Return hit rates of the retrieval and query-embedding caches.
+        
+        Latency saved is estimated as cache hits times the mean latency of an
+        uncached search.
+        """
+        stats = self._retrieval_cache.stats()
+        mean_miss_ms = self._search_miss_seconds / self._search_misses * 1000 if self._search_misses else 0.0
+        stats["mean_search_ms"] = round(mean_miss_ms, 2)
+        stats["latency_saved_ms"] = round(stats["hits"] * mean_miss_ms, 1)
+        stats["query_embeddings"] = self.embeddings.query_cache.stats()
+        if self.reranker is not None:
+            stats["reranker"] = self.reranker.stats()
+        return stats
     
     def query(self, query: str, k: int = 3) -> List[str]:
         """
@@ -138,7 +490,7 @@ class NephrologyRAG:
             if not self.load_existing_database():
                 return ["No knowledge base available."]
         
-        results = self.vectorstore.similarity_search(query, k=k)
+        results = self.search(query, k=k)
         return [doc.page_content for doc in results]
 
 
@@ -290,19 +642,32 @@ This guide is for educational purposes. Always follow your healthcare provider's
 """
 
 
-def setup_rag_system(pdf_directory: str = "references", force_recreate: bool = False):
+def setup_rag_system(
+    pdf_directory: str = "references",
+    force_recreate: bool = False,
+    incremental: bool = RAG_INCREMENTAL_SYNC
+):
     """
     Setup the RAG system with nephrology knowledge.
     
     Args:
         pdf_directory: Directory containing PDF files
         force_recreate: Force recreation of vector database even if it exists
+        incremental: Sync the database with pdf_directory, only re-indexing
+            files that were added, changed or removed
         
     Returns:
         NephrologyRAG instance
     """
     rag = NephrologyRAG()
     
+    # Incremental sync when reference PDFs are present, or when files indexed by an
+    # earlier sync may have been removed (including the last one)
+    if incremental and (find_pdf_files(pdf_directory) or os.path.exists(rag._manifest_path())):
+        print(f"Syncing vector database with {pdf_directory}...")
+        rag.sync_directory(pdf_directory, rebuild=force_recreate)
+        return rag
+    
     # Check if database
     if os.path.exists(rag.persist_directory) and not force_recreate:
         print("Existing vector database found. Loading...")
@@ -314,8 +679,7 @@ def setup_rag_system(pdf_directory: str = "references", force_recreate: bool = F
         pdf_files = [f for f in os.listdir(pdf_directory) if f.endswith('.pdf')]
         if pdf_files:
             print(f"Found {len(pdf_files)} PDF file(s) in {pdf_directory}")
-            documents = rag.load_documents_from_directory(pdf_directory)
-            rag.create_vector_database(documents)
+            rag.index_pdf_files(sorted(find_pdf_files(pdf_directory).values()))
             return rag
     
     # Fallback: Create sample content
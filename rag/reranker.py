@@ -0,0 +1,124 @@
+"""
+Cross-Encoder Reranker
+Reranks retrieved chunks with a small CPU cross-encoder under a per-query time budget
+"""
+import os
+import threading
+import time
+from typing import List, Tuple
+
+
+RAG_RERANK = os.getenv("RAG_RERANK", "False").lower() == "true"
+RERANK_MODEL_NAME = os.getenv("RAG_RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+# Candidates retrieved for reranking, and the time allowed to score them
+RERANK_CANDIDATES = int(os.getenv("RAG_RERANK_CANDIDATES", "12"))
+RERANK_BUDGET_MS = float(os.getenv("RAG_RERANK_BUDGET_MS", "150"))
+
+# Query-chunk pairs scored per forward pass; the budget is checked between batches
+RERANK_BATCH_SIZE = int(os.getenv("RAG_RERANK_BATCH_SIZE", "4"))
+
+# Tokens per query-chunk pair; longer chunks are truncated
+RERANK_MAX_LENGTH = 256
+
+
+class CrossEncoderReranker:
+    """Time-budgeted cross-encoder reranking"""
+
+    def __init__(
+        self,
+        model_name: str = RERANK_MODEL_NAME,
+        budget_ms: float = RERANK_BUDGET_MS,
+        batch_size: int = RERANK_BATCH_SIZE,
+        device: str = "cpu"
+    ):
+        """
+        Initialize the reranker (the model is loaded on first use).
+
+        Args:
+            model_name: sentence-transformers CrossEncoder model
+            budget_ms: Time allowed per query; when exceeded, the input order is kept
+            batch_size: Pairs scored per forward pass
+            device: torch device
+        """
+        self.model_name = model_name
+        self.budget_ms = budget_ms
+        self.batch_size = batch_size
+        self.device = device
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.reranked = 0
+        self.fallbacks = 0
+        self.total_ms = 0.0
+
+    @property
+    def model(self):
+        """The cross-encoder, loaded and warmed up on first access."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+
+                    model = CrossEncoder(self.model_name, max_length=RERANK_MAX_LENGTH, device=self.device)
+                    # The first forward pass is much slower than later ones; keep it out of the budget
+                    model.predict([("warmup", "warmup")], show_progress_bar=False)
+                    self._model = model
+        return self._model
+
+    def rerank(self, query: str, docs: List, k: int) -> Tuple[List, bool]:
+        """
+        Rerank documents by cross-encoder relevance.
+
+        Pairs are scored in batches. If the next batch would push the time spent
+        past the budget, scoring stops and the documents keep their input
+        (retrieval) order.
+
+        Args:
+            query: Search query
+            docs: Candidate documents, best first
+            k: Number of documents to return
+
+        Returns:
+            The top k documents and whether they were reranked
+        """
+        if len(docs) <= 1:
+            return docs[:k], True
+
+        model = self.model
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+        scores = []
+        batch_seconds = 0.0
+        for offset in range(0, len(docs), self.batch_size):
+            if offset and time.perf_counter() + batch_seconds > deadline:
+                break
+            batch_start = time.perf_counter()
+            pairs = [(query, doc.page_content) for doc in docs[offset:offset + self.batch_size]]
+            scores.extend(model.predict(pairs, batch_size=len(pairs), show_progress_bar=False).tolist())
+            batch_seconds = time.perf_counter() - batch_start
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        completed = len(scores) == len(docs) and elapsed_ms <= self.budget_ms
+        with self._stats_lock:
+            self.total_ms += elapsed_ms
+            if completed:
+                self.reranked += 1
+            else:
+                self.fallbacks += 1
+
+        if not completed:
+            return docs[:k], False
+        order = sorted(range(len(docs)), key=lambda i: scores[i], reverse=True)
+        return [docs[i] for i in order[:k]], True
+
+    def stats(self) -> dict:
+        """Return reranked/fallback counts and mean time per query."""
+        with self._stats_lock:
+            queries = self.reranked + self.fallbacks
+            return {
+                "reranked": self.reranked,
+                "fallbacks": self.fallbacks,
+                "mean_ms": round(self.total_ms / queries, 2) if queries else 0.0,
+                "budget_ms": self.budget_ms
+            }
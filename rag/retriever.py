@@ -0,0 +1,29 @@
+"""
+Knowledge Base Retriever
+LangChain retriever that serves results through NephrologyRAG's cached search
+"""
+from typing import Any, List
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+
+class NephrologyRetriever(BaseRetriever):
+    """Retriever backed by NephrologyRAG.search"""
+
+    rag: Any
+    """The NephrologyRAG instance to search."""
+
+    k: int = 3
+    """Number of documents to return."""
+
+    @property
+    def index_version(self) -> int:
+        """Version of the underlying index; changes whenever its contents change."""
+        return self.rag.index_version
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.rag.search(query, k=self.k)
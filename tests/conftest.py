@@ -0,0 +1,114 @@
+"""
+Test Fixtures
+Shared fixtures for the test suite
+"""
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tests run offline
+os.environ.setdefault("CREWAI_TRACING_ENABLED", "false")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+
+# Imported once the environment above is in place
+from crewai.llms.base_llm import BaseLLM
+from crewai.tools.base_tool import Tool as CrewAITool
+
+JOHN_SMITH = {
+    "patient_id": "P001",
+    "patient_name": "John Smith",
+    "age": 58,
+    "gender": "Male",
+    "discharge_date": "2024-01-15",
+    "primary_diagnosis": "Chronic Kidney Disease Stage 3",
+    "secondary_diagnosis": "Hypertension, Type 2 Diabetes",
+    "medications": ["Lisinopril 10mg daily", "Furosemide 20mg twice daily"],
+    "dietary_restrictions": "Low sodium (2g/day), fluid restriction (1.5L/day)",
+    "warning_signs": "Swelling in legs or ankles, shortness of breath",
+    "follow_up_date": "2024-02-15",
+    "doctor": "Dr. Sarah Johnson"
+}
+
+
+class RecordingPool:
+    """Stands in for a CrewPool, recording the inputs of each kickoff"""
+
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.inputs = []
+
+    def kickoff(self, inputs: dict) -> str:
+        self.inputs.append(inputs)
+        return self.reply
+
+
+class OfflineLLM(BaseLLM):
+    """Stands in for the Gemini model; tests never reach it"""
+
+    def call(self, messages, *args, **kwargs):
+        raise AssertionError("The LLM must not be called in offline tests")
+
+
+def crewai_tool(name: str, func, description: str) -> CrewAITool:
+    """Build the agents' tools as CrewAI tools, which the installed CrewAI requires"""
+    return CrewAITool.from_langchain(SimpleNamespace(name=name, func=func, description=description))
+
+
+@pytest.fixture
+def make_crew(monkeypatch):
+    """
+    Return a factory for MedicalAICrew instances that run offline.
+
+    The real constructor runs with a stub LLM; the receptionist and clinical
+    crews are then replaced by RecordingPool instances, so routing, memory
+    and caching can be tested without model calls.
+    """
+    import agents.crew
+
+    monkeypatch.setattr(agents.crew, "ChatGoogleGenerativeAI", lambda model, **kwargs: OfflineLLM(model=model))
+    monkeypatch.setattr(agents.crew, "Tool", crewai_tool)
+
+    def make(rag_retriever=None):
+        crew = agents.crew.MedicalAICrew(rag_retriever)
+        crew.receptionist_pool = RecordingPool("Receptionist reply.")
+        crew.clinical_pool = RecordingPool("Clinical reply.")
+        return crew
+
+    return make
+
+
+@pytest.fixture
+def bare_crew(make_crew):
+    """A MedicalAICrew without knowledge base whose crews record their inputs"""
+    return make_crew()
+
+
+@pytest.fixture
+def patient_roster(tmp_path, monkeypatch):
+    """
+    Point the global patient repository at a temporary roster file.
+
+    Returns a function that writes the given patient records to the file.
+    """
+    import json
+
+    from tools import patient_store, patient_tool
+    from utils.cache import LRUCache
+
+    path = tmp_path / "patients.json"
+    monkeypatch.setattr(patient_store, "_global_repository", patient_store.JsonPatientRepository(str(path)))
+    # Rendered reports are keyed by repository version, which restarts with each repository
+    monkeypatch.setattr(patient_tool, "_report_cache", LRUCache(maxsize=patient_tool.REPORT_CACHE_SIZE))
+
+    def write(patients):
+        path.write_text(json.dumps(patients))
+        return path
+
+    return write
@@ -0,0 +1,87 @@
+"""
+Conversation Memory Tests
+Patient pinning and message processing when the patient roster is unavailable
+"""
+import asyncio
+import threading
+
+from agents.crew import NO_PATIENT
+
+from conftest import JOHN_SMITH
+
+
+def test_message_processed_when_roster_missing(bare_crew, patient_roster):
+    # The roster fixture points at a file that has not been written
+    response = bare_crew.process_message("Hello there", session_id="s1")
+
+    assert response == "Receptionist reply."
+    assert bare_crew.receptionist_pool.inputs[-1]["patient"] == NO_PATIENT
+
+
+def test_async_and_streamed_messages_processed_when_roster_missing(bare_crew, patient_roster, monkeypatch):
+    monkeypatch.setattr(bare_crew, "_stream_receptionist_task", lambda message, memory: iter(["Streamed reply."]))
+
+    assert asyncio.run(bare_crew.aprocess_message("Hello there")) == "Receptionist reply."
+    assert "".join(bare_crew.stream_message("Hello there")) == "Streamed reply."
+
+
+def test_message_processed_when_roster_corrupt(bare_crew, patient_roster):
+    patient_roster([JOHN_SMITH]).write_text("[{\"patient_id\": ")
+
+    assert bare_crew.process_message("Hi, my name is John Smith") == "Receptionist reply."
+
+
+def test_patient_named_in_message_is_pinned(bare_crew, patient_roster):
+    patient_roster([JOHN_SMITH])
+
+    bare_crew.process_message("Hi, my name is John Smith", session_id="s1")
+
+    assert bare_crew.get_memory_stats("s1")["patient"] == "P001"
+    assert "Chronic Kidney Disease Stage 3" in bare_crew.receptionist_pool.inputs[-1]["patient"]
+
+
+def test_async_message_does_not_block_event_loop(bare_crew, patient_roster, monkeypatch):
+    patient_roster([JOHN_SMITH])
+    threads = []
+    get_memory = bare_crew._get_memory
+    is_medical = bare_crew._is_medical_question
+
+    def recording(func):
+        def wrapper(*args):
+            threads.append(threading.current_thread())
+            return func(*args)
+        return wrapper
+
+    monkeypatch.setattr(bare_crew, "_get_memory", recording(get_memory))
+    monkeypatch.setattr(bare_crew, "_is_medical_question", recording(is_medical))
+
+    assert asyncio.run(bare_crew.aprocess_message("Hi, my name is John Smith")) == "Receptionist reply."
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_async_cache_lookup_error_cancels_retrieval(bare_crew, patient_roster, monkeypatch):
+    patient_roster([])
+    release = threading.Event()
+    monkeypatch.setattr(bare_crew, "_session_context", lambda message, memory: release.wait(5) and "")
+
+    class FailingCache:
+        def lookup(self, message, version=None):
+            raise RuntimeError("cache unavailable")
+
+        def record_bypass(self):
+            pass
+
+    bare_crew.response_cache = FailingCache()
+
+    async def ask():
+        response = await bare_crew.aprocess_message("What foods should I avoid with kidney disease?")
+        # Let the cancelled retrieval task finish
+        await asyncio.sleep(0)
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return response, tasks
+
+    response, pending = asyncio.run(ask())
+    release.set()
+    assert "cache unavailable" in response
+    assert pending == []
@@ -0,0 +1,48 @@
+"""
+Crew Pool Tests
+Pooled crews run real CrewAI agents against a scripted LLM
+"""
+import re
+from types import SimpleNamespace
+
+from crewai.llms.base_llm import BaseLLM
+from crewai.tools.base_tool import Tool
+
+from agents.crew_pool import CrewPool
+
+from conftest import JOHN_SMITH
+
+DIAGNOSIS_PATTERN = re.compile(r'"primary_diagnosis": "([^"]*)"')
+
+
+class PatientIDLookupLLM(BaseLLM):
+    """Calls PatientIDLookup for P001, then answers with the primary diagnosis it returned"""
+
+    def call(self, messages, *args, **kwargs):
+        if len(messages) <= 2:
+            return 'Thought: I should look up the patient\nAction: PatientIDLookup\nAction Input: {"patient_id": "P001"}'
+        diagnosis = DIAGNOSIS_PATTERN.search(str(messages[-1]["content"])).group(1)
+        return f"Thought: I now know the final answer\nFinal Answer: {diagnosis}"
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+
+def test_roster_change_visible_through_reused_crew(bare_crew, patient_roster):
+    bare_crew.llm = PatientIDLookupLLM(model="scripted")
+    bare_crew.patient_tool = Tool.from_langchain(SimpleNamespace(
+        name="PatientReportRetrieval", description="Patient report by name", func=bare_crew._lookup_patient_report
+    ))
+    bare_crew.patient_id_tool = Tool.from_langchain(SimpleNamespace(
+        name="PatientIDLookup", description="Patient record by ID", func=bare_crew._lookup_patient_id
+    ))
+    pool = CrewPool(bare_crew._build_receptionist_crew, size=1)
+    inputs = {"message": "My patient ID is P001", "history": "", "patient": ""}
+
+    patient_roster([JOHN_SMITH])
+    assert str(pool.kickoff(inputs)) == "Chronic Kidney Disease Stage 3"
+
+    # A different diagnosis length changes the file size, so the reload never depends on mtime resolution
+    patient_roster([dict(JOHN_SMITH, primary_diagnosis="Acute Kidney Injury")])
+    assert str(pool.kickoff(inputs)) == "Acute Kidney Injury"
+    assert pool.stats()["reused"] == 1
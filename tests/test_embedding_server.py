@@ -0,0 +1,86 @@
+"""
+Embedding Sidecar Tests
+Client reconnects and socket permissions, with a stand-in embedding engine
+"""
+import os
+import socket
+import stat
+import threading
+import time
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from rag.embedding_server import EmbeddingServer, SidecarEmbeddings
+
+
+class CountingEngine(Embeddings):
+    """Returns fixed vectors and counts the queries it embeds"""
+
+    model_id = "counting-engine"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.queries = 0
+
+    def embed_documents(self, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.queries += 1
+        time.sleep(self.delay)
+        return [float(len(text)), 1.0]
+
+
+def start_server(socket_path: str, engine: Embeddings) -> EmbeddingServer:
+    server = EmbeddingServer(socket_path, engine)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop_server(server: EmbeddingServer):
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "embeddings.sock")
+
+
+def test_socket_created_owner_and_group_only(socket_path):
+    server = start_server(socket_path, CountingEngine())
+    try:
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o660
+    finally:
+        stop_server(server)
+
+
+def test_reconnects_after_sidecar_restart(socket_path):
+    engine = CountingEngine()
+    server = start_server(socket_path, engine)
+    client = SidecarEmbeddings(socket_path)
+    assert client.embed_query("kidney") == [6.0, 1.0]
+
+    # Break the kept-alive connection, as the sidecar exiting would
+    stop_server(server)
+    client._local.sock.shutdown(socket.SHUT_RDWR)
+    server = start_server(socket_path, engine)
+    try:
+        assert client.embed_query("renal") == [5.0, 1.0]
+        assert engine.queries == 2
+    finally:
+        stop_server(server)
+
+
+def test_timed_out_request_not_resent(socket_path):
+    engine = CountingEngine(delay=0.5)
+    server = start_server(socket_path, engine)
+    try:
+        client = SidecarEmbeddings(socket_path, timeout=0.1)
+        with pytest.raises(socket.timeout):
+            client.embed_query("slow")
+        time.sleep(0.6)
+        assert engine.queries == 1
+    finally:
+        stop_server(server)
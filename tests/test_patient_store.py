@@ -0,0 +1,77 @@
+"""
+Patient Store Tests
+JSON roster parsing, reloads and the fuzzy name index
+"""
+import io
+import json
+
+import pytest
+
+from tools.patient_store import JsonPatientRepository, PatientRepository, iter_json_array
+
+from conftest import JOHN_SMITH
+
+
+def test_reload_publishes_new_roster(tmp_path):
+    path = tmp_path / "patients.json"
+    path.write_text(json.dumps([JOHN_SMITH]))
+    repository = JsonPatientRepository(str(path))
+    assert repository.find_by_id("P001")["patient_name"] == "John Smith"
+    assert repository.version == 1
+
+    path.write_text(json.dumps([dict(JOHN_SMITH, patient_name="Jonathan Smith")]))
+
+    assert repository.find_by_name("John Smith") == []
+    assert repository.find_by_id("p001")["patient_name"] == "Jonathan Smith"
+    assert repository.version == 2
+    assert len(repository) == 1
+
+
+def test_json_array_parsed_with_any_chunk_size():
+    text = '[1234, 5, -6.5e3, "split string", true, null, {"patient_id": "P001", "ages": [58, 1234567]}, [ ], 7 ]'
+    expected = json.loads(text)
+
+    for chunk_size in range(1, len(text) + 2):
+        assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == expected, chunk_size
+
+
+def test_lookup_returns_version_of_its_snapshot(tmp_path):
+    path = tmp_path / "patients.json"
+    path.write_text(json.dumps([JOHN_SMITH]))
+    repository = JsonPatientRepository(str(path))
+    patient, version = repository.lookup_id("P001")
+    assert (patient["age"], version) == (58, 1)
+
+    path.write_text(json.dumps([dict(JOHN_SMITH, age=590)]))
+
+    patient, version = repository.lookup_id("P001")
+    assert (patient["age"], version) == (590, 2)
+    patients, version = repository.lookup_name("John Smith")
+    assert (patients[0]["age"], version) == (590, 2)
+
+
+def test_repository_backends_must_implement_lookups():
+    with pytest.raises(TypeError):
+        PatientRepository()
+
+
+def test_name_index_tagged_with_version_it_was_built_from(tmp_path):
+    path = tmp_path / "patients.json"
+    path.write_text(json.dumps([JOHN_SMITH]))
+    other = JsonPatientRepository(str(path))
+    repository = JsonPatientRepository(str(path))
+    assert repository._name_index_lock is not other._name_index_lock
+
+    # The roster is replaced between search_names()'s refresh and the index build
+    refresh = repository.refresh
+    replacements = [json.dumps([dict(JOHN_SMITH, patient_name="Jonathan Smithers")])]
+
+    def refresh_then_replace():
+        refresh()
+        if replacements:
+            path.write_text(replacements.pop())
+
+    repository.refresh = refresh_then_replace
+
+    assert repository.search_names("Jonathan Smithers")[0][0] == "jonathan smithers"
+    assert repository._name_index_version == repository.version == 2
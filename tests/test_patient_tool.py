@@ -0,0 +1,57 @@
+"""
+Patient Tool Tests
+Name lookups release a record only for an exact name or a patient ID
+"""
+from tools.patient_tool import DEFAULT_REPORT_HEADING, get_patient_report, get_report_cache_stats, search_patient_by_id
+
+from conftest import JOHN_SMITH
+
+
+JANE_SMITH = dict(JOHN_SMITH, patient_id="P002", patient_name="Jane Smith", primary_diagnosis="Nephrotic Syndrome")
+
+
+def test_exact_name_returns_report(patient_roster):
+    patient_roster([JOHN_SMITH, JANE_SMITH])
+
+    report = get_patient_report("john smith")
+
+    assert report.lstrip().startswith(DEFAULT_REPORT_HEADING)
+    assert "Chronic Kidney Disease Stage 3" in report
+
+
+def test_near_miss_lists_names_without_record(patient_roster):
+    patient_roster([JOHN_SMITH, JANE_SMITH])
+
+    result = get_patient_report("Jon Smith")
+
+    assert "John Smith" in result
+    assert DEFAULT_REPORT_HEADING not in result
+    assert "P001" not in result
+    assert "Chronic Kidney Disease" not in result
+
+
+def test_surname_lists_names_without_ids(patient_roster):
+    patient_roster([JOHN_SMITH, JANE_SMITH])
+
+    result = get_patient_report("Smith")
+
+    assert "P001" not in result and "P002" not in result
+    assert "Nephrotic Syndrome" not in result
+
+
+def test_patient_id_returns_record(patient_roster):
+    patient_roster([JOHN_SMITH, JANE_SMITH])
+
+    assert '"patient_name": "Jane Smith"' in search_patient_by_id("p002")
+
+
+def test_report_rendered_again_after_roster_change(patient_roster):
+    patient_roster([JOHN_SMITH])
+    assert "Chronic Kidney Disease Stage 3" in get_patient_report("John Smith")
+    assert get_report_cache_stats()["misses"] == 1
+
+    # A different diagnosis length changes the file size, so the reload never depends on mtime resolution
+    patient_roster([dict(JOHN_SMITH, primary_diagnosis="Acute Kidney Injury")])
+
+    assert "Acute Kidney Injury" in get_patient_report("John Smith")
+    assert get_report_cache_stats()["misses"] == 2
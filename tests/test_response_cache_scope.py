@@ -0,0 +1,130 @@
+"""
+Response Cache Scope Tests
+Which messages may be answered from, and stored in, the semantic response cache
+"""
+from agents.response_cache import SemanticResponseCache, involves_patient_data
+
+from conftest import JOHN_SMITH
+
+
+class RecordingResponseCache:
+    """Stands in for SemanticResponseCache; never hits"""
+
+    def __init__(self):
+        self.lookups = []
+        self.stored = []
+        self.bypasses = 0
+
+    def lookup(self, message, version=None):
+        self.lookups.append(message)
+        return None
+
+    def store(self, message, response, version=None):
+        self.stored.append(message)
+
+    def record_bypass(self):
+        self.bypasses += 1
+
+
+QUESTION = "What foods should I avoid with chronic kidney disease?"
+
+
+def test_first_message_uses_cache(bare_crew, patient_roster):
+    bare_crew.response_cache = RecordingResponseCache()
+    patient_roster([])
+
+    bare_crew.process_message(QUESTION, session_id="s1")
+
+    assert bare_crew.response_cache.lookups == [QUESTION]
+    assert bare_crew.response_cache.stored == [QUESTION]
+
+
+def test_follow_up_bypasses_cache(bare_crew, patient_roster):
+    bare_crew.response_cache = RecordingResponseCache()
+    patient_roster([])
+
+    bare_crew.process_message("Hello there", session_id="s1")
+    bare_crew.process_message(QUESTION, session_id="s1")
+
+    assert bare_crew.response_cache.lookups == []
+    assert bare_crew.response_cache.stored == []
+    assert bare_crew.response_cache.bypasses == 1
+
+
+def test_history_passed_by_caller_bypasses_cache(bare_crew, patient_roster):
+    bare_crew.response_cache = RecordingResponseCache()
+    patient_roster([])
+    history = [
+        {"role": "user", "content": "I was discharged after dialysis"},
+        {"role": "assistant", "content": "Thanks for letting me know."},
+    ]
+
+    bare_crew.process_message(QUESTION, conversation_history=history)
+
+    assert bare_crew.response_cache.lookups == []
+
+
+def test_introduction_with_known_patient_bypasses_cache(bare_crew, patient_roster):
+    bare_crew.response_cache = RecordingResponseCache()
+    patient_roster([JOHN_SMITH])
+
+    bare_crew.process_message("I'm John Smith, what should I eat with kidney disease?")
+
+    assert bare_crew.response_cache.lookups == []
+    assert bare_crew.response_cache.bypasses == 1
+
+
+def test_introduction_with_unknown_name_bypasses_cache(bare_crew, patient_roster):
+    bare_crew.response_cache = RecordingResponseCache()
+    patient_roster([JOHN_SMITH])
+
+    bare_crew.process_message("I'm Jane Doe, what should I eat with kidney disease?")
+
+    assert bare_crew.response_cache.lookups == []
+
+
+def test_involves_patient_data():
+    assert involves_patient_data("Hi, I'm John Smith. Can I eat bananas?")
+    assert involves_patient_data("What does P001 need to avoid?")
+    assert involves_patient_data("what are my medications?")
+    assert not involves_patient_data("I'm worried about swelling in my legs, is that normal?")
+    assert not involves_patient_data(QUESTION)
+
+
+def test_first_question_after_app_greeting_uses_cache(bare_crew, patient_roster):
+    bare_crew.response_cache = RecordingResponseCache()
+    patient_roster([])
+    # The Streamlit app opens every conversation with an assistant greeting
+    messages = [{"role": "assistant", "content": "Hello! 👋 I'm your post-discharge care assistant."}]
+
+    messages.append({"role": "user", "content": QUESTION})
+    bare_crew.process_message(QUESTION, messages, session_id="app")
+    messages.append({"role": "user", "content": "And what about potassium?"})
+    bare_crew.process_message("And what about potassium?", messages, session_id="app")
+
+    assert bare_crew.response_cache.lookups == [QUESTION]
+    assert bare_crew.response_cache.bypasses == 1
+
+
+class OneHotEmbeddings:
+    """Embeds each distinct question as its own axis, so only exact repeats match"""
+
+    def __init__(self):
+        self.axes = {}
+
+    def embed_query(self, text):
+        index = self.axes.setdefault(text, len(self.axes))
+        return [1.0 if i == index else 0.0 for i in range(8)]
+
+
+def test_answer_from_older_knowledge_base_is_not_stored():
+    cache = SemanticResponseCache(OneHotEmbeddings())
+    cache.lookup(QUESTION, version=1)
+    cache.lookup("What is eGFR?", version=2)
+    cache.store("What is eGFR?", "Current answer.", version=2)
+
+    # A request that started before the re-index finishes last
+    cache.store(QUESTION, "Outdated answer.", version=1)
+
+    assert cache.lookup("What is eGFR?", version=2) == "Current answer."
+    assert cache.lookup(QUESTION, version=2) is None
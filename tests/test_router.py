@@ -0,0 +1,29 @@
+"""
+Intent Router Tests
+Keyword routing without the embedding classifier
+"""
+import pytest
+
+from agents.router import CLINICAL, RECEPTIONIST, IntentRouter
+
+
+@pytest.mark.parametrize("message", [
+    "Hello, I have chest pain",
+    "Hi, I think I am having an emergency",
+    "Hello! I have a fever",
+    "My name is John Smith, I have swelling",
+    "Good morning, I feel dizzy",
+])
+def test_greeting_with_symptom_routes_to_clinical(message):
+    assert IntentRouter().route(message) == CLINICAL
+
+
+@pytest.mark.parametrize("message", [
+    "Hello",
+    "Hi there!",
+    "My name is John Smith",
+    "Can I see my discharge summary?",
+    "Thanks for your help",
+])
+def test_reception_messages_route_to_receptionist(message):
+    assert IntentRouter().route(message) == RECEPTIONIST
@@ -0,0 +1,102 @@
+"""
+Streaming Tests
+Early-closed streams, pooled crews, retried LLM calls and the streamed disclaimer
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+from agents.crew_pool import CrewPool
+from agents.streaming import _dispatch_chunk, stream_crew
+
+
+class ScriptedLLM:
+    """Streams each reply of a script as one chunk per call"""
+
+    def __init__(self, replies):
+        self.stream = False
+        self.replies = list(replies)
+
+    def call(self, messages, **kwargs):
+        reply = self.replies.pop(0)
+        _dispatch_chunk(self, SimpleNamespace(tool_call=None, agent_id="streaming-test-agent", chunk=reply))
+        return reply
+
+
+class BlockingCrew:
+    """Makes one LLM call per scripted reply, then keeps running until released"""
+
+    def __init__(self, llm, result="Hello"):
+        self.agents = [SimpleNamespace(id="streaming-test-agent", llm=llm)]
+        self.finish = threading.Event()
+        self.result = result
+        self.llm_during_kickoff = None
+
+    def kickoff(self, inputs):
+        llm = self.llm_during_kickoff = self.agents[0].llm
+        while llm.replies:
+            llm.call([])
+        self.finish.wait(5)
+        return self.result
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_closed_stream_returns_crew_after_kickoff():
+    llm = ScriptedLLM(["Final Answer: Hello"])
+    crew = BlockingCrew(llm)
+    pool = CrewPool(lambda: crew, size=1)
+    borrowed = pool.acquire()
+
+    stream = stream_crew(borrowed, {}, on_finish=lambda: pool.release(borrowed))
+    assert next(stream) == "Hello"
+    stream.close()
+
+    # The kickoff is still running, so the crew must not be handed out again yet
+    assert pool.stats()["idle"] == 0
+    crew.finish.set()
+    assert wait_until(lambda: pool.stats()["idle"] == 1)
+
+
+def test_kickoff_streams_through_a_copy_of_the_llm():
+    llm = ScriptedLLM(["Final Answer: Hello"])
+    crew = BlockingCrew(llm)
+    crew.finish.set()
+    finished = threading.Event()
+
+    stream = stream_crew(crew, {}, on_finish=finished.set)
+    assert "".join(stream) == "Hello"
+
+    assert finished.wait(5)
+    # The LLM may be shared with other crews, so it is never switched to streaming itself
+    assert crew.llm_during_kickoff is not llm
+    assert crew.llm_during_kickoff.stream is True
+    assert llm.stream is False
+    assert crew.agents[0].llm is llm
+
+
+def test_reasoning_of_retried_call_is_not_streamed():
+    # A final answer that fails to parse is retried with a new LLM call
+    llm = ScriptedLLM(["Final Answer: Draft", "Thought: fix the format\nFinal Answer: Done"])
+    crew = BlockingCrew(llm, result="Done")
+    crew.finish.set()
+
+    assert "".join(stream_crew(crew, {})) == "DraftDone"
+
+
+def test_disclaimer_streamed_when_final_answer_differs(bare_crew, patient_roster, monkeypatch):
+    patient_roster([])
+    crew = BlockingCrew(ScriptedLLM(["Final Answer: Draft answer."]), result="Revised answer.")
+    crew.finish.set()
+    bare_crew.clinical_pool = CrewPool(lambda: crew, size=1)
+    monkeypatch.setattr(bare_crew, "_session_context", lambda message, memory: "")
+
+    response = "".join(bare_crew.stream_message("What foods should I avoid with kidney disease?"))
+
+    assert response.startswith("Draft answer.")
+    assert "Medical Disclaimer" in response
@@ -0,0 +1,142 @@
+"""
+Tavily Client Tests
+Retries, request coalescing, caching and rate limiting against a local stub server
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tools.tavily_client import RateLimitExceeded, TavilySearchClient
+
+
+class StubTavilyServer(ThreadingHTTPServer):
+    """Answers searches like the Tavily API, optionally failing the first requests for a query"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubTavilyHandler)
+        self.lock = threading.Lock()
+        self.queries = []
+        self.failures = {}
+        self.delay = 0.0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/search"
+
+
+class StubTavilyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        query = payload["query"]
+        with self.server.lock:
+            self.server.queries.append(query)
+            failures = self.server.failures.get(query, 0)
+            if failures:
+                self.server.failures[query] = failures - 1
+        if failures:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        time.sleep(self.server.delay)
+        body = json.dumps({"results": [{"title": "Result", "url": "https://example.org", "content": query}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def stub_server():
+    server = StubTavilyServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server: StubTavilyServer, **kwargs) -> TavilySearchClient:
+    kwargs.setdefault("rate_limit", 100)
+    kwargs.setdefault("burst", 100)
+    return TavilySearchClient("test-key", base_url=server.url, timeout=5, **kwargs)
+
+
+def test_retries_retryable_status(stub_server):
+    stub_server.failures["flaky query"] = 2
+    client = make_client(stub_server)
+
+    result = client.search("flaky query")
+
+    assert result["results"][0]["content"] == "flaky query"
+    assert stub_server.queries == ["flaky query"] * 3
+    assert client.stats()["requests_sent"] == 1
+
+
+def test_gives_up_after_max_retries(stub_server):
+    stub_server.failures["down"] = 10
+    client = make_client(stub_server, max_retries=1)
+
+    with pytest.raises(Exception):
+        client.search("down")
+    assert len(stub_server.queries) == 2
+
+
+def test_concurrent_equivalent_searches_share_one_request(stub_server):
+    stub_server.delay = 0.3
+    client = make_client(stub_server)
+    queries = ["CKD diet"] * 10 + ["  ckd   DIET "] * 10
+
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        results = list(executor.map(lambda q: client.search(q, include_domains=["b.org", "a.org"]), queries))
+
+    assert len(stub_server.queries) == 1
+    assert client.stats()["coalesced"] == len(queries) - 1
+    assert all(result == results[0] for result in results)
+
+
+def test_repeated_search_served_from_cache(stub_server):
+    client = make_client(stub_server)
+
+    client.search("ckd diet", include_domains=["a.org", "b.org"])
+    client.search("CKD Diet", include_domains=["B.org", "a.org"])
+
+    assert len(stub_server.queries) == 1
+    assert client.stats()["cache"]["hits"] == 1
+
+
+def test_token_bucket_paces_requests(stub_server):
+    client = make_client(stub_server, rate_limit=10, burst=2)
+
+    start = time.monotonic()
+    for i in range(6):
+        client.search(f"query {i}")
+    elapsed = time.monotonic() - start
+
+    # Two requests go out at once; the other four wait for a token each (0.1 s apart)
+    assert len(stub_server.queries) == 6
+    assert elapsed >= 0.35
+    assert client.stats()["rate_limit_wait_s"] > 0
+
+
+def test_rate_limit_exceeded_when_no_slot_within_timeout(stub_server):
+    client = TavilySearchClient("test-key", base_url=stub_server.url, timeout=0.1, rate_limit=1, burst=1)
+
+    client.search("first")
+    with pytest.raises(RateLimitExceeded):
+        client.search("second")
+    assert stub_server.queries == ["first"]
@@ -0,0 +1,240 @@
+"""
+Fuzzy Patient Name Index
+Ranks near matches for misspelled or partial patient names
+"""
+import re
+from array import array
+from itertools import chain, islice
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+# Maximum edit distance between a query token and an indexed token
+MAX_EDIT_DISTANCE = 1
+
+# Upper bound on names scored per query, so very common tokens stay cheap
+MAX_CANDIDATES = 5000
+
+_TOKEN_SPLIT = re.compile(r"[^\w']+")
+
+
+def tokenize_name(name: str) -> List[str]:
+    """Split a normalized name into tokens, dropping punctuation such as initials' dots."""
+    return [token for token in _TOKEN_SPLIT.split(name) if token]
+
+
+def _deletes(token: str, distance: int) -> Set[str]:
+    """All strings reachable from token by deleting up to `distance` characters."""
+    results = {token}
+    frontier = {token}
+    for _ in range(distance):
+        next_frontier = set()
+        for word in frontier:
+            for i in range(len(word)):
+                next_frontier.add(word[:i] + word[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance between two strings, short-circuiting past `limit`.
+
+    Returns:
+        The distance, or limit + 1 if it exceeds the limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class NameIndex:
+    """
+    Symmetric-delete edit-distance index over patient name tokens.
+
+    Every distinct token is indexed under each string obtained by deleting up
+    to `max_distance` characters, so near tokens are found with a handful of
+    dict lookups instead of a scan. Whole names are then scored by how well
+    their tokens line up with the query tokens.
+    """
+
+    def __init__(self, names: Iterable[str], max_distance: int = MAX_EDIT_DISTANCE):
+        """
+        Build the index.
+
+        Args:
+            names: Normalized patient names (duplicates are ignored)
+            max_distance: Maximum edit distance between matching tokens
+        """
+        self.max_distance = max_distance
+        self.names: List[str] = []
+        self._token_ids: Dict[str, int] = {}
+        self._tokens: List[str] = []
+        self._postings: List[array] = []
+        self._deletes: Dict[str, object] = {}
+
+        seen = set()
+        for name in names:
+            if name in seen:
+                continue
+            seen.add(name)
+            name_id = len(self.names)
+            self.names.append(name)
+            for token in set(tokenize_name(name)):
+                token_id = self._token_ids.get(token)
+                if token_id is None:
+                    token_id = self._add_token(token)
+                self._postings[token_id].append(name_id)
+
+    def _add_token(self, token: str) -> int:
+        """Register a new vocabulary token and its deletion variants."""
+        token_id = len(self._tokens)
+        self._token_ids[token] = token_id
+        self._tokens.append(token)
+        self._postings.append(array('I'))
+        for variant in _deletes(token, self.max_distance):
+            # Most variants map to a single token; only promote to a list on collision
+            existing = self._deletes.get(variant)
+            if existing is None:
+                self._deletes[variant] = token_id
+            elif isinstance(existing, int):
+                self._deletes[variant] = [existing, token_id]
+            else:
+                existing.append(token_id)
+        return token_id
+
+    def _near_tokens(self, token: str) -> Dict[int, float]:
+        """Map vocabulary token IDs within max_distance of `token` to a 0-1 similarity."""
+        candidates = set()
+        for variant in _deletes(token, self.max_distance):
+            entry = self._deletes.get(variant)
+            if entry is None:
+                continue
+            if isinstance(entry, int):
+                candidates.add(entry)
+            else:
+                candidates.update(entry)
+
+        near = {}
+        for token_id in candidates:
+            other = self._tokens[token_id]
+            distance = edit_distance(token, other, self.max_distance)
+            if distance <= self.max_distance:
+                near[token_id] = 1.0 - distance / max(len(token), len(other))
+        return near
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.6) -> List[Tuple[str, float]]:
+        """
+        Find names that approximately match a query.
+
+        Args:
+            query: Normalized query name
+            limit: Maximum number of matches to return
+            min_score: Minimum score (0-1) for a match to be returned
+
+        Returns:
+            List of (name, score) tuples, best first
+        """
+        query_tokens = tokenize_name(query)
+        if not query_tokens:
+            return []
+
+        # Single letters are treated as initials and only used for scoring
+        full_tokens = [token for token in query_tokens if len(token) > 1] or query_tokens
+        near_by_token = {token: self._near_tokens(token) for token in set(full_tokens)}
+
+        # Candidates must fuzzy-match every query token that exists in the
+        # vocabulary; intersect starting from the rarest token
+        postings_by_token = sorted(
+            (
+                (sum(len(self._postings[token_id]) for token_id in near), near)
+                for near in near_by_token.values() if near
+            ),
+            key=lambda item: item[0]
+        )
+        if not postings_by_token:
+            return []
+
+        rarest = postings_by_token[0][1]
+        candidates = set(chain.from_iterable(self._postings[token_id] for token_id in rarest))
+        for _, near in postings_by_token[1:]:
+            candidates.intersection_update(chain.from_iterable(self._postings[token_id] for token_id in near))
+            if not candidates:
+                break
+
+        if not candidates:
+            # One token is badly misspelled; fall back to the rarest token alone
+            candidates = set(islice(
+                chain.from_iterable(self._postings[token_id] for token_id in rarest), MAX_CANDIDATES
+            ))
+        elif len(candidates) > MAX_CANDIDATES:
+            candidates = set(islice(candidates, MAX_CANDIDATES))
+
+        scored = []
+        for name_id in candidates:
+            name = self.names[name_id]
+            score = self._score(query_tokens, tokenize_name(name), near_by_token)
+            if score >= min_score:
+                scored.append((name, round(score, 3)))
+
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def _token_similarity(self, query_token: str, name_token: str, near_by_token: Dict[str, Dict[int, float]]) -> float:
+        """Similarity of one query token to one name token."""
+        if query_token == name_token:
+            return 1.0
+        if len(query_token) == 1 or len(name_token) == 1:
+            # Initial against a full token
+            return 0.9 if query_token[0] == name_token[0] else 0.0
+        near = near_by_token.get(query_token)
+        token_id = self._token_ids.get(name_token)
+        if near is None or token_id is None:
+            return 0.0
+        return near.get(token_id, 0.0)
+
+    def _score(self, query_tokens: List[str], name_tokens: List[str], near_by_token) -> float:
+        """
+        Score a candidate name against the query.
+
+        Averages how well each query token is covered by the name and how well
+        each full name token is covered by the query. Middle initials missing
+        from the query cost only a small penalty.
+        """
+        query_cover = sum(
+            max(self._token_similarity(q, n, near_by_token) for n in name_tokens)
+            for q in query_tokens
+        ) / len(query_tokens)
+
+        full_name_tokens = [n for n in name_tokens if len(n) > 1] or name_tokens
+        name_cover = sum(
+            max(self._token_similarity(q, n, near_by_token) for q in query_tokens)
+            for n in full_name_tokens
+        ) / len(full_name_tokens)
+
+        unmatched_initials = sum(
+            1 for n in name_tokens
+            if len(n) == 1 and not any(q[0] == n for q in query_tokens if len(q) == 1)
+        )
+        return (query_cover + name_cover) / 2 - 0.02 * unmatched_initials
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+if __name__ == "__main__":
+    index = NameIndex(["john smith", "john a. smith", "maria garcia", "robert johnson", "joan smyth"])
+    for query in ["jon smith", "john smith", "maria garsia", "robert", "smith"]:
+        print(f"{query!r}: {index.search(query)}")
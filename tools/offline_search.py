@@ -0,0 +1,259 @@
+"""
+Offline Web Search
+BM25 search over a local mirror of trusted medical pages, for deployments without Tavily access
+
+Usage:
+    python tools/offline_search.py mirror https://www.kidney.org/atoz/content/dialysisinfo ...
+    python tools/offline_search.py mirror --urls-file urls.txt
+    python tools/offline_search.py search "low potassium diet"
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+# Add project root to path so this module can also be run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.patient_store import DATA_DIR
+from utils.bm25 import BM25Index
+
+
+OFFLINE_CORPUS_DIR = os.getenv("OFFLINE_CORPUS_DIR", os.path.join(DATA_DIR, "web_mirror"))
+PAGES_FILENAME = "pages.jsonl"
+
+# Pages are indexed as passages of about this many characters so results quote the relevant part
+PASSAGE_CHARS = 700
+
+# Elements whose text is kept when mirroring a page
+CONTENT_TAGS = ["h1", "h2", "h3", "h4", "p", "li"]
+
+
+def split_passages(text: str, max_chars: int = PASSAGE_CHARS) -> List[str]:
+    """Group paragraphs into passages of at most about max_chars characters."""
+    passages, current = [], ""
+    for paragraph in (p.strip() for p in text.split("\n")):
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 1 > max_chars:
+            passages.append(current)
+            current = paragraph
+        else:
+            current = f"{current}\n{paragraph}" if current else paragraph
+    if current:
+        passages.append(current)
+    return passages
+
+
+def domain_of(url: str) -> str:
+    """Registered host of a URL without a leading www."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class OfflineSearchIndex:
+    """Passage-level BM25 index over the mirrored pages, reloaded when the mirror changes"""
+
+    def __init__(self, corpus_dir: str = OFFLINE_CORPUS_DIR):
+        """
+        Initialize the index (built on first search).
+
+        Args:
+            corpus_dir: Directory containing pages.jsonl
+        """
+        self.pages_path = os.path.join(corpus_dir, PAGES_FILENAME)
+        self.pages: List[dict] = []
+        self._passages: List[tuple] = []
+        self._index: Optional[BM25Index] = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Rebuild the index if pages.jsonl changed since it was built."""
+        try:
+            stat = os.stat(self.pages_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+
+        with self._lock:
+            if signature == self._signature and self._index is not None:
+                return
+            pages = list(load_pages(self.pages_path)) if signature else []
+            passages = [
+                (page_number, passage)
+                for page_number, page in enumerate(pages)
+                for passage in split_passages(page.get("content", ""))
+            ]
+            self._index = BM25Index(f"{pages[n].get('title', '')}\n{passage}" for n, passage in passages)
+            self.pages = pages
+            self._passages = passages
+            self._signature = signature
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self.pages)
+
+    def search(self, query: str, max_results: int = 3, include_domains: Optional[Iterable[str]] = None) -> dict:
+        """
+        Search the mirror.
+
+        Args:
+            query: Search query
+            max_results: Maximum number of pages returned
+            include_domains: Restrict results to these domains (None: all mirrored domains)
+
+        Returns:
+            Tavily-style response: {"results": [{"title", "url", "content", "score"}, ...]}
+        """
+        self.refresh()
+        domains = {domain.lower() for domain in include_domains} if include_domains else None
+        results, seen_pages = [], set()
+
+        # Best passage per page; over-fetch since several passages may come from one page
+        for position, score in self._index.search(query, k=max_results * 5):
+            page_number, passage = self._passages[position]
+            if page_number in seen_pages:
+                continue
+            page = self.pages[page_number]
+            domain = page.get("domain") or domain_of(page["url"])
+            if domains and not any(domain == d or domain.endswith("." + d) for d in domains):
+                continue
+            seen_pages.add(page_number)
+            results.append({
+                "title": page.get("title", page["url"]),
+                "url": page["url"],
+                "content": passage,
+                "score": round(score, 4)
+            })
+            if len(results) >= max_results:
+                break
+        return {"query": query, "results": results}
+
+
+def load_pages(path: str) -> Iterable[dict]:
+    """Yield mirrored pages from a JSON Lines file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def fetch_page(url: str, timeout: float = 30) -> dict:
+    """
+    Download a page and extract its readable text.
+
+    Args:
+        url: Page URL
+        timeout: Request timeout in seconds
+
+    Returns:
+        Page record with url, domain, title and content
+    """
+    import requests
+    from bs4 import BeautifulSoup
+
+    response = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0 (offline mirror)"})
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, "html.parser")
+    for element in soup(["script", "style", "nav", "header", "footer", "aside", "form"]):
+        element.decompose()
+
+    root = soup.find("main") or soup.find("article") or soup.body or soup
+    paragraphs = [
+        " ".join(tag.get_text(" ", strip=True).split())
+        for tag in root.find_all(CONTENT_TAGS)
+    ]
+    title = soup.title.get_text(strip=True) if soup.title else url
+    return {
+        "url": url,
+        "domain": domain_of(url),
+        "title": title,
+        "content": "\n".join(p for p in paragraphs if p)
+    }
+
+
+def mirror_pages(urls: Iterable[str], corpus_dir: str = OFFLINE_CORPUS_DIR) -> Dict[str, int]:
+    """
+    Fetch pages into the mirror, replacing earlier copies of the same URL.
+
+    Args:
+        urls: Page URLs to mirror
+        corpus_dir: Mirror directory
+
+    Returns:
+        Counts of mirrored and failed pages
+    """
+    os.makedirs(corpus_dir, exist_ok=True)
+    path = os.path.join(corpus_dir, PAGES_FILENAME)
+    pages = {page["url"]: page for page in load_pages(path)} if os.path.exists(path) else {}
+    summary = {"mirrored": 0, "failed": 0}
+
+    for url in urls:
+        try:
+            page = fetch_page(url)
+            if not page["content"]:
+                raise ValueError("no readable text found")
+            pages[url] = page
+            summary["mirrored"] += 1
+            print(f"✅ {url}: {len(page['content'])} characters")
+        except Exception as e:
+            summary["failed"] += 1
+            print(f"❌ {url}: {e}")
+
+    # Write atomically so a running index never reads a partial file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for page in pages.values():
+            f.write(json.dumps(page, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, path)
+    return summary
+
+
+_global_index = None
+_global_index_lock = threading.Lock()
+
+
+def get_offline_index() -> OfflineSearchIndex:
+    """Get or create the global offline search index"""
+    global _global_index
+    if _global_index is None:
+        with _global_index_lock:
+            if _global_index is None:
+                _global_index = OfflineSearchIndex()
+    return _global_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    mirror_parser = subparsers.add_parser("mirror", help="Fetch pages into the offline mirror")
+    mirror_parser.add_argument("urls", nargs="*")
+    mirror_parser.add_argument("--urls-file", help="File with one URL per line")
+    mirror_parser.add_argument("--corpus-dir", default=OFFLINE_CORPUS_DIR)
+
+    search_parser = subparsers.add_parser("search", help="Search the offline mirror")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--max-results", type=int, default=3)
+    search_parser.add_argument("--corpus-dir", default=OFFLINE_CORPUS_DIR)
+
+    args = parser.parse_args()
+    if args.command == "mirror":
+        urls = list(args.urls)
+        if args.urls_file:
+            with open(args.urls_file, "r", encoding="utf-8") as f:
+                urls.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+        summary = mirror_pages(urls, args.corpus_dir)
+        print(f"Mirrored {summary['mirrored']} pages ({summary['failed']} failed)")
+    else:
+        index = OfflineSearchIndex(args.corpus_dir)
+        for result in index.search(args.query, max_results=args.max_results)["results"]:
+            print(f"{result['score']:.2f}  {result['title']}\n      {result['url']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+SQLite Patient Repository
+On-disk patient roster shared by several processes, plus a JSON importer
+
+Usage:
+    python tools/patient_sqlite.py data/patients.json data/patients.db
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+# Add project root to path so the importer can also be run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.patient_store import (
+    DATA_DIR, DEFAULT_PATIENT_FILE, PatientRepository,
+    iter_patient_records, normalize_id, normalize_name
+)
+
+
+DEFAULT_PATIENT_DB = os.getenv("PATIENT_DB_PATH", os.path.join(DATA_DIR, "patients.db"))
+
+# Rows written per executemany() call during import
+IMPORT_BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE patients (
+    position INTEGER PRIMARY KEY,
+    patient_id TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    record TEXT NOT NULL
+)
+"""
+
+INDEXES = [
+    "CREATE INDEX idx_patients_id ON patients (patient_id)",
+    "CREATE INDEX idx_patients_name ON patients (name_key)",
+]
+
+
+def import_json_to_sqlite(
+    json_path: str = DEFAULT_PATIENT_FILE,
+    db_path: str = DEFAULT_PATIENT_DB,
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> int:
+    """
+    Import a patients JSON/JSON Lines file into a new SQLite database.
+
+    The database is built next to the target and swapped in with an atomic
+    rename, so running repositories never see a half-written roster.
+
+    Args:
+        json_path: Source .json array or .jsonl file
+        db_path: Target SQLite database path
+        batch_size: Rows inserted per batch
+
+    Returns:
+        Number of patient records imported
+    """
+    target_dir = os.path.dirname(os.path.abspath(db_path))
+    fd, tmp_path = tempfile.mkstemp(suffix=".db", dir=target_dir)
+    os.close(fd)
+
+    count = 0
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute(SCHEMA)
+
+            batch = []
+            for patient in iter_patient_records(json_path):
+                batch.append((
+                    count,
+                    normalize_id(patient["patient_id"]),
+                    normalize_name(patient["patient_name"]),
+                    json.dumps(patient, separators=(",", ":"), ensure_ascii=False)
+                ))
+                count += 1
+                if len(batch) >= batch_size:
+                    conn.executemany("INSERT INTO patients VALUES (?, ?, ?, ?)", batch)
+                    batch = []
+            if batch:
+                conn.executemany("INSERT INTO patients VALUES (?, ?, ?, ?)", batch)
+
+            # Building indexes after the bulk insert is much faster than maintaining them
+            for statement in INDEXES:
+                conn.execute(statement)
+            conn.execute("ANALYZE")
+            conn.commit()
+        finally:
+            conn.close()
+
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return count
+
+
+class SQLitePatientRepository(PatientRepository):
+    """Patient roster served from an indexed SQLite database"""
+
+    def __init__(self, db_path: str = DEFAULT_PATIENT_DB):
+        """
+        Initialize the SQLite repository.
+
+        Each thread gets its own read-only connection. Connections are
+        reopened when the database file is replaced by a new import.
+
+        Args:
+            db_path: Path to a database created by import_json_to_sqlite
+        """
+        super().__init__()
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._signature = None
+        self.version = 0
+
+    def _file_signature(self):
+        """Return (inode, mtime, size) of the database; raises FileNotFoundError if missing."""
+        stat = os.stat(self.db_path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def refresh(self):
+        """
+        Detect a re-imported database and bump the version.
+
+        Raises:
+            FileNotFoundError: If the database file does not exist
+        """
+        signature = self._file_signature()
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._signature = signature
+                    self.version += 1
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it after a re-import."""
+        return self._versioned_connection()[0]
+
+    def _versioned_connection(self) -> Tuple[sqlite3.Connection, int]:
+        """Return this thread's connection and the version of the database it reads."""
+        self.refresh()
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.version != self.version:
+            if conn is not None:
+                conn.close()
+            uri = "file:" + os.path.abspath(self.db_path) + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True)
+            self._local.conn = conn
+            self._local.version = self.version
+        return conn, self._local.version
+
+    def lookup_name(self, patient_name: str) -> Tuple[List[dict], int]:
+        conn, version = self._versioned_connection()
+        rows = conn.execute(
+            "SELECT record FROM patients WHERE name_key = ? ORDER BY position",
+            (normalize_name(patient_name),)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows], version
+
+    def lookup_id(self, patient_id: str) -> Tuple[Optional[dict], int]:
+        conn, version = self._versioned_connection()
+        row = conn.execute(
+            "SELECT record FROM patients WHERE patient_id = ? ORDER BY position LIMIT 1",
+            (normalize_id(patient_id),)
+        ).fetchone()
+        return (json.loads(row[0]) if row else None), version
+
+    def lookup_name_keys(self) -> Tuple[Iterator[str], int]:
+        """Return every distinct normalized patient name, read straight off the name index."""
+        conn, version = self._versioned_connection()
+        cursor = conn.execute("SELECT DISTINCT name_key FROM patients ORDER BY name_key")
+        return (name_key for (name_key,) in cursor), version
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(DISTINCT patient_id) FROM patients").fetchone()[0]
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATIENT_FILE
+    target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATIENT_DB
+
+    print(f"Importing {source} into {target}...")
+    imported = import_json_to_sqlite(source, target)
+    print(f"Imported {imported} patient records")
+
+    repository = SQLitePatientRepository(target)
+    print(repository.find_by_name("John Smith"))
@@ -0,0 +1,396 @@
+"""
+Patient Store
+Patient repository interface and the JSON file backend
+"""
+import json
+import os
+from abc import ABC, abstractmethod
+import re
+import threading
+from typing import Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple, Union
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+DEFAULT_PATIENT_FILE = os.getenv("PATIENT_DATA_FILE", os.path.join(DATA_DIR, "patients.json"))
+
+# Backend used by the patient tools: "json" or "sqlite"
+PATIENT_DB_BACKEND = os.getenv("PATIENT_DB_BACKEND", "json").lower()
+
+# Read size for the incremental JSON array parser
+READ_CHUNK_SIZE = 1 << 16
+
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a patient name for index lookups (case and whitespace insensitive)."""
+    return " ".join(name.casefold().split())
+
+
+def normalize_id(patient_id: str) -> str:
+    """Normalize a patient ID for index lookups."""
+    return patient_id.strip().upper()
+
+
+def iter_json_lines(f: TextIO) -> Iterator[dict]:
+    """
+    Yield records from a JSON Lines file, one object per non-empty line.
+
+    Args:
+        f: Open text file
+
+    Yields:
+        Patient records
+    """
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _next_char(buf: str, pos: int) -> str:
+    """Return the first non-whitespace character at or after pos ("" if none)."""
+    pos = _WHITESPACE.match(buf, pos).end()
+    return buf[pos:pos + 1]
+
+
+def iter_json_array(f: TextIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Yield the elements of a top-level JSON array without loading the whole file.
+
+    Only the unparsed tail of the current read chunk plus one element is held
+    in memory at a time.
+
+    Args:
+        f: Open text file containing a JSON array
+        chunk_size: Number of characters to read per chunk
+
+    Yields:
+        Array elements in file order
+
+    Raises:
+        json.JSONDecodeError: If the file is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size)
+    pos = 0
+    eof = not buf
+    state = "start"
+
+    while True:
+        # Skip whitespace, pulling in more data if the chunk runs out
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos >= len(buf):
+            if eof:
+                raise json.JSONDecodeError("Unexpected end of patient data", buf, pos)
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        char = buf[pos]
+        if state == "start":
+            if char != "[":
+                raise json.JSONDecodeError("Expected a JSON array of patients", buf, pos)
+            pos += 1
+            state = "first"
+            continue
+        if state in ("first", "next"):
+            if char == "]":
+                return
+            if state == "next":
+                if char != ",":
+                    raise json.JSONDecodeError("Expected ',' or ']'", buf, pos)
+                pos += 1
+                state = "value"
+                continue
+            state = "value"
+
+        try:
+            record, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Element straddles the chunk boundary
+            if eof:
+                raise
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        # A scalar cut by the chunk boundary can still decode (12 of 1234, -6 of -6.5e3),
+        # so it is only accepted once the delimiter after it has been read
+        if not eof and not isinstance(record, (dict, list)) and _next_char(buf, end) not in (",", "]"):
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        yield record
+        pos = end
+        state = "next"
+
+
+def iter_patient_records(patient_file: str) -> Iterator[dict]:
+    """
+    Stream patient records from a JSON array or JSON Lines file.
+
+    Args:
+        patient_file: Path to a .json array or .jsonl/.ndjson file
+
+    Yields:
+        Patient records
+    """
+    with open(patient_file, 'r', encoding='utf-8') as f:
+        if patient_file.lower().endswith(JSON_LINES_EXTENSIONS):
+            yield from iter_json_lines(f)
+        else:
+            yield from iter_json_array(f)
+
+
+# Index values hold a single record position, or a tuple of them for duplicate names
+IndexEntry = Union[int, Tuple[int, ...]]
+
+
+class RosterSnapshot(NamedTuple):
+    """One loaded version of the roster; replaced as a whole, never modified"""
+
+    records: List[bytes]
+    by_name: Dict[str, IndexEntry]
+    by_id: Dict[str, int]
+    signature: Optional[Tuple[int, int]]
+    version: int
+
+
+EMPTY_SNAPSHOT = RosterSnapshot([], {}, {}, None, 0)
+
+
+class PatientRepository(ABC):
+    """Interface shared by the patient roster backends"""
+
+    # Incremented whenever the underlying data changes
+    version = 0
+
+    def __init__(self):
+        # Fuzzy name index, built on the first search_names() call
+        self._name_index = None
+        self._name_index_version = None
+        self._name_index_lock = threading.Lock()
+
+    @abstractmethod
+    def refresh(self):
+        """Pick up changes to the underlying data, if any."""
+
+    @abstractmethod
+    def lookup_name(self, patient_name: str) -> Tuple[List[dict], int]:
+        """Return all patients whose normalized name matches, and the version they were read from."""
+
+    @abstractmethod
+    def lookup_id(self, patient_id: str) -> Tuple[Optional[dict], int]:
+        """Return the patient with the given ID (or None), and the version it was read from."""
+
+    @abstractmethod
+    def lookup_name_keys(self) -> Tuple[Iterator[str], int]:
+        """Return every distinct normalized patient name, and the version they were read from."""
+
+    def find_by_name(self, patient_name: str) -> List[dict]:
+        """
+        Find patients by full name.
+
+        Args:
+            patient_name: The full name of the patient (case-insensitive)
+
+        Returns:
+            List of matching patient records (empty if none)
+        """
+        return self.lookup_name(patient_name)[0]
+
+    def find_by_id(self, patient_id: str) -> Optional[dict]:
+        """
+        Find a patient by patient ID.
+
+        Args:
+            patient_id: The patient ID (case-insensitive, e.g., P001)
+
+        Returns:
+            The patient record, or None if not found
+        """
+        return self.lookup_id(patient_id)[0]
+
+    def name_keys(self) -> Iterator[str]:
+        """Yield every distinct normalized patient name."""
+        return self.lookup_name_keys()[0]
+
+    def search_names(self, patient_name: str, limit: int = 5, min_score: float = 0.6) -> List[Tuple[str, float]]:
+        """
+        Rank patient names that approximately match a query.
+
+        The fuzzy index is built on first use and rebuilt after the data changes.
+
+        Args:
+            patient_name: Name as typed by the patient
+            limit: Maximum number of matches to return
+            min_score: Minimum similarity (0-1) for a match
+
+        Returns:
+            List of (normalized name, score) tuples, best first
+        """
+        self.refresh()
+        if self._name_index is None or self._name_index_version != self.version:
+            with self._name_index_lock:
+                if self._name_index is None or self._name_index_version != self.version:
+                    from tools.name_index import NameIndex
+                    names, version = self.lookup_name_keys()
+                    self._name_index = NameIndex(names)
+                    self._name_index_version = version
+        return self._name_index.search(normalize_name(patient_name), limit=limit, min_score=min_score)
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of distinct patients."""
+
+
+class JsonPatientRepository(PatientRepository):
+    """In-memory patient roster with hash indexes on name and patient ID"""
+
+    def __init__(self, patient_file: str = DEFAULT_PATIENT_FILE):
+        """
+        Initialize the JSON repository.
+
+        The file is not read until the first lookup. Records are kept as
+        compact UTF-8 JSON and decoded on lookup, so resident memory is close
+        to the size of the minified file rather than the size of the parsed
+        Python objects.
+
+        Args:
+            patient_file: Path to the patients file (.json array or .jsonl)
+        """
+        super().__init__()
+        self.patient_file = patient_file
+        self._lock = threading.Lock()
+        # Readers take this reference once per lookup, so they never see a half-swapped roster
+        self._snapshot = EMPTY_SNAPSHOT
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def _file_signature(self):
+        """Return (mtime, size) of the patient file; raises FileNotFoundError if missing."""
+        stat = os.stat(self.patient_file)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _build_indexes(self, patients: Iterator[dict]):
+        """Build compact record storage and name/ID indexes record by record."""
+        records: List[bytes] = []
+        by_name: Dict[str, IndexEntry] = {}
+        by_id: Dict[str, int] = {}
+        for patient in patients:
+            position = len(records)
+            records.append(json.dumps(patient, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+            name_key = normalize_name(patient["patient_name"])
+            existing = by_name.get(name_key)
+            if existing is None:
+                by_name[name_key] = position
+            elif isinstance(existing, int):
+                by_name[name_key] = (existing, position)
+            else:
+                by_name[name_key] = existing + (position,)
+
+            # Keep the first record for a duplicated ID, matching the old linear scan
+            by_id.setdefault(normalize_id(patient["patient_id"]), position)
+        return records, by_name, by_id
+
+    def refresh(self):
+        """
+        Reload the roster if the file changed since the last load.
+
+        Raises:
+            FileNotFoundError: If the patient file does not exist
+            json.JSONDecodeError: If the patient file is not valid JSON
+        """
+        signature = self._file_signature()
+        if signature == self._snapshot.signature:
+            return
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            signature = self._file_signature()
+            snapshot = self._snapshot
+            if signature == snapshot.signature:
+                return
+
+            records, by_name, by_id = self._build_indexes(iter_patient_records(self.patient_file))
+            self._snapshot = RosterSnapshot(records, by_name, by_id, signature, snapshot.version + 1)
+
+    def _current(self) -> RosterSnapshot:
+        """Refresh, then return the roster snapshot a lookup should use."""
+        self.refresh()
+        return self._snapshot
+
+    def lookup_name(self, patient_name: str) -> Tuple[List[dict], int]:
+        snapshot = self._current()
+        entry = snapshot.by_name.get(normalize_name(patient_name))
+        if entry is None:
+            return [], snapshot.version
+        if isinstance(entry, int):
+            entry = (entry,)
+        return [json.loads(snapshot.records[position]) for position in entry], snapshot.version
+
+    def lookup_id(self, patient_id: str) -> Tuple[Optional[dict], int]:
+        snapshot = self._current()
+        position = snapshot.by_id.get(normalize_id(patient_id))
+        if position is None:
+            return None, snapshot.version
+        return json.loads(snapshot.records[position]), snapshot.version
+
+    def lookup_name_keys(self) -> Tuple[Iterator[str], int]:
+        snapshot = self._current()
+        return iter(list(snapshot.by_name)), snapshot.version
+
+    def __len__(self) -> int:
+        return len(self._current().by_id)
+
+
+def create_patient_repository(backend: str = PATIENT_DB_BACKEND) -> PatientRepository:
+    """
+    Create a patient repository for the configured backend.
+
+    Args:
+        backend: "json" (default) or "sqlite"
+
+    Returns:
+        PatientRepository instance
+    """
+    if backend == "json":
+        return JsonPatientRepository()
+    if backend == "sqlite":
+        from tools.patient_sqlite import SQLitePatientRepository
+        return SQLitePatientRepository()
+    raise ValueError(f"Unknown patient repository backend: {backend}")
+
+
+# Global repository instance
+_global_repository = None
+_global_repository_lock = threading.Lock()
+
+
+def get_patient_repository() -> PatientRepository:
+    """Get or create the global patient repository instance"""
+    global _global_repository
+    if _global_repository is None:
+        with _global_repository_lock:
+            if _global_repository is None:
+                _global_repository = create_patient_repository()
+    return _global_repository
+
+
+if __name__ == "__main__":
+    # Test the repository
+    repository = get_patient_repository()
+    print(f"Loaded {len(repository)} patients (version {repository.version})")
+    print(repository.find_by_name("  john   SMITH "))
+    print(repository.find_by_id("p002"))
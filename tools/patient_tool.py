@@ -4,40 +4,47 @@ Retrieves discharge summaries for patients by name
 """
 import json
 import os
+import re
+import sys
 from typing import Optional
 
+# Add project root to path so the tool can also be run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.patient_store import get_patient_repository
+from utils.cache import LRUCache
 
-def get_patient_report(patient_name: str) -> str:
-    """
-    Retrieve patient's discharge report by name.
-    
-    Args:
-        patient_name: The full name of the patient (case-insensitive)
-        
-    Returns:
-        JSON string with patient information or error message
-    """
-    try:
-        # project root
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        patient_file = os.path.join(current_dir, "data", "patients.json")
-        
-        with open(patient_file, 'r') as f:
-            patients = json.load(f)
-        
-        # Search for patient
-        patient_name_lower = patient_name.lower().strip()
-        matches = [p for p in patients if p["patient_name"].lower() == patient_name_lower]
-        
-        if len(matches) == 0:
-            return f"❌ No patient found with name '{patient_name}'. Please check the spelling and try again."
-        elif len(matches) > 1:
-            return f"⚠️ Multiple patients found with name '{patient_name}'. Please provide more specific information (e.g., patient ID)."
-        
-        # Format the patient
-        patient = matches[0]
-        report = f"""
-✅ **Patient Discharge Summary Found**
+
+# Fuzzy matching of names that have no exact match (only names are suggested, never records)
+FUZZY_MIN_SCORE = 0.6
+FUZZY_MAX_CANDIDATES = 5
+
+DEFAULT_REPORT_HEADING = "✅ **Patient Discharge Summary Found**"
+
+# Patient IDs and self-introductions that identify a patient without an agent tool call
+PATIENT_ID_PATTERN = re.compile(r"\bP\d{3,}\b", re.IGNORECASE)
+INTRODUCTION_PATTERN = re.compile(
+    r"\b(?:my\s+name\s+is|my\s+name's|i\s+am|i'm|this\s+is|name\s*:)\s+"
+    r"([A-Za-z][A-Za-z.'-]*(?:\s+[A-Za-z][A-Za-z.'-]*){0,3})",
+    re.IGNORECASE
+)
+
+# Longest name tried when a message only contains a name
+MAX_NAME_WORDS = 4
+
+# Rendered reports keyed by (format, patient ID, name, repository version)
+REPORT_CACHE_SIZE = int(os.getenv("PATIENT_REPORT_CACHE_SIZE", "1024"))
+_report_cache = LRUCache(maxsize=REPORT_CACHE_SIZE)
+
+
+def format_patient_report(patient: dict, heading: str = DEFAULT_REPORT_HEADING) -> str:
+    """Render a patient record as the markdown discharge summary."""
+    return f"\n{heading}{_format_report_body(patient)}"
+
+
+def _format_report_body(patient: dict) -> str:
+    """Render everything below the heading of the discharge summary."""
+    return f"""
 
 **Patient Information:**
 - Patient ID: {patient['patient_id']}
@@ -66,7 +73,83 @@ def get_patient_report(patient_name: str) -> str:
 ---
 📋 This discharge summary is retrieved from hospital records.
 """
-        return report
+
+
+def _cached_render(kind: str, patient: dict, version: int, render) -> str:
+    """
+    Return a rendered view of a patient record, rendering it at most once per data version.
+
+    version must be the one the record was read from (see PatientRepository.lookup_name).
+
+    The repository version is part of the key, so reports rendered before
+    the roster changed are never served; they age out of the LRU cache.
+    """
+    key = (kind, patient["patient_id"], patient["patient_name"], version)
+    rendered = _report_cache.get(key)
+    if rendered is None:
+        rendered = render(patient)
+        _report_cache.set(key, rendered)
+    return rendered
+
+
+def get_report_cache_stats() -> dict:
+    """Return hit/miss counters for the rendered report cache."""
+    return _report_cache.stats()
+
+
+def _resolve_fuzzy(patient_name: str, repository) -> str:
+    """
+    Suggest names for a name with no exact match, without releasing any record.
+
+    Only the candidate names are listed: no discharge details and no patient
+    IDs, so a near miss never exposes another patient's record. The patient
+    must give their exact registered name or their patient ID before a
+    record is returned.
+    """
+    matches = repository.search_names(patient_name, limit=FUZZY_MAX_CANDIDATES, min_score=FUZZY_MIN_SCORE)
+    if not matches:
+        return f"❌ No patient found with name '{patient_name}'. Please check the spelling and try again."
+
+    names = []
+    for name, _ in matches:
+        for patient in repository.find_by_name(name):
+            if patient["patient_name"] not in names:
+                names.append(patient["patient_name"])
+    lines = [f"⚠️ No exact match for '{patient_name}'. Similar registered names:"]
+    lines.extend(f"- {name}" for name in names)
+    lines.append(
+        "No record has been released. Ask the patient to confirm their full name exactly as "
+        "registered, or to provide their patient ID, and look the record up again."
+    )
+    return "\n".join(lines)
+
+
+def get_patient_report(patient_name: str) -> str:
+    """
+    Retrieve patient's discharge report by name.
+    
+    A name with no exact match gets a list of similar registered names
+    to confirm with the patient; no record is returned for it.
+    
+    Args:
+        patient_name: The full name of the patient (case-insensitive)
+        
+    Returns:
+        JSON string with patient information or error message
+    """
+    try:
+        # Indexed lookup; the store only re-parses the file when it changes
+        repository = get_patient_repository()
+        # The version comes from the same roster snapshot as the record it is cached with
+        matches, version = repository.lookup_name(patient_name)
+        
+        if len(matches) == 0:
+            return _resolve_fuzzy(patient_name, repository)
+        elif len(matches) > 1:
+            return f"⚠️ Multiple patients found with name '{patient_name}'. Please provide more specific information (e.g., patient ID)."
+        
+        body = _cached_render("report_body", matches[0], version, _format_report_body)
+        return f"\n{DEFAULT_REPORT_HEADING}{body}"
         
     except FileNotFoundError:
         return "❌ Error: Patient database file not found. Please contact system administrator."
@@ -76,6 +159,42 @@ def get_patient_report(patient_name: str) -> str:
         return f"❌ Error retrieving patient information: {str(e)}"
 
 
+def find_patient_in_message(message: str) -> Optional[dict]:
+    """
+    Identify the patient a message refers to, without fuzzy guessing.
+
+    A patient ID ("P001") is looked up first; otherwise the name after an
+    introduction ("my name is John Smith", "I'm John Smith") or a message
+    that is only a name must match exactly one patient. Words after the
+    name ("I'm John Smith and ...") are dropped one at a time until the
+    name matches.
+
+    Args:
+        message: User message
+
+    Returns:
+        The patient record, or None if no single patient is identified
+    """
+    repository = get_patient_repository()
+    for patient_id in PATIENT_ID_PATTERN.findall(message):
+        patient = repository.find_by_id(patient_id)
+        if patient is not None:
+            return patient
+
+    candidates = [match.group(1) for match in INTRODUCTION_PATTERN.finditer(message)]
+    words = message.strip().rstrip(".!").split()
+    if 2 <= len(words) <= MAX_NAME_WORDS:
+        candidates.append(" ".join(words))
+
+    for candidate in candidates:
+        words = candidate.rstrip(".").split()
+        for length in range(len(words), 1, -1):
+            matches = repository.find_by_name(" ".join(words[:length]))
+            if len(matches) == 1:
+                return matches[0]
+    return None
+
+
 def search_patient_by_id(patient_id: str) -> str:
     """
     Retrieve patient's discharge report by patient ID.
@@ -87,19 +206,13 @@ def search_patient_by_id(patient_id: str) -> str:
         JSON string with patient information or error message
     """
     try:
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        patient_file = os.path.join(current_dir, "data", "patients.json")
-        
-        with open(patient_file, 'r') as f:
-            patients = json.load(f)
+        repository = get_patient_repository()
+        patient, version = repository.lookup_id(patient_id)
         
-        matches = [p for p in patients if p["patient_id"].upper() == patient_id.upper()]
-        
-        if len(matches) == 0:
+        if patient is None:
             return f"❌ No patient found with ID '{patient_id}'."
         
-        patient = matches[0]
-        return json.dumps(patient, indent=2)
+        return _cached_render("json", patient, version, lambda p: json.dumps(p, indent=2))
         
     except Exception as e:
         return f"❌ Error: {str(e)}"
@@ -111,4 +224,6 @@ if __name__ == "__main__":
     print("\n" + "="*60)
     result = get_patient_report("John Smith")
     print(result)
+    get_patient_report("John Smith")
+    print(f"Report cache: {get_report_cache_stats()}")
 
@@ -0,0 +1,200 @@
+"""
+Tavily Search Client
+Shared Tavily client with connection pooling, retries, a TTL cache, request coalescing and rate limiting
+"""
+import os
+import sys
+import threading
+from concurrent.futures import Future
+from typing import Dict, Hashable, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Add project root to path so this module can also be run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.embedding_cache import normalize_query
+from utils.cache import LRUCache
+from utils.rate_limit import TokenBucket
+
+
+TAVILY_API_URL = os.getenv("TAVILY_API_URL", "https://api.tavily.com/search")
+TAVILY_TIMEOUT = float(os.getenv("TAVILY_TIMEOUT", "20"))
+TAVILY_POOL_SIZE = int(os.getenv("TAVILY_POOL_SIZE", "10"))
+TAVILY_MAX_RETRIES = int(os.getenv("TAVILY_MAX_RETRIES", "3"))
+
+# Search results are reused for identical queries for this many seconds
+TAVILY_CACHE_TTL = float(os.getenv("TAVILY_CACHE_TTL", "3600"))
+TAVILY_CACHE_SIZE = int(os.getenv("TAVILY_CACHE_SIZE", "1024"))
+
+# Outbound request rate (requests/second) and burst size
+TAVILY_RATE_LIMIT = float(os.getenv("TAVILY_RATE_LIMIT", "5"))
+TAVILY_BURST = float(os.getenv("TAVILY_BURST", "10"))
+
+# Statuses worth retrying (with exponential backoff, honoring Retry-After)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when no request slot frees up within the client timeout"""
+
+
+class TavilySearchClient:
+    """Thread-safe Tavily search client shared by all web searches"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = TAVILY_API_URL,
+        timeout: float = TAVILY_TIMEOUT,
+        pool_size: int = TAVILY_POOL_SIZE,
+        max_retries: int = TAVILY_MAX_RETRIES,
+        cache_ttl: Optional[float] = TAVILY_CACHE_TTL,
+        cache_size: int = TAVILY_CACHE_SIZE,
+        rate_limit: float = TAVILY_RATE_LIMIT,
+        burst: float = TAVILY_BURST
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: Tavily API key
+            base_url: Search endpoint URL
+            timeout: Seconds per HTTP request (also the longest wait for a rate-limit slot)
+            pool_size: Keep-alive connections kept open to the API host
+            max_retries: Retries for connection errors and retryable statuses
+            cache_ttl: Seconds a result stays cached (None: no expiry)
+            cache_size: Maximum number of cached results
+            rate_limit: Requests per second sent to the API
+            burst: Requests that may be sent at once before rate limiting applies
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+
+        self.cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+        self.limiter = TokenBucket(rate_limit, burst)
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self.requests_sent = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def cache_key(query: str, include_domains: Optional[Iterable[str]], max_results: int, search_depth: str) -> tuple:
+        """Key identifying equivalent searches: normalized query, domain set and result options."""
+        domains = tuple(sorted({domain.lower() for domain in include_domains or ()}))
+        return (normalize_query(query), domains, max_results, search_depth)
+
+    def _post(self, query: str, include_domains, max_results: int, search_depth: str) -> dict:
+        """Send one search request."""
+        if not self.limiter.acquire(timeout=self.timeout):
+            raise RateLimitExceeded(f"No Tavily request slot available within {self.timeout}s")
+        payload = {
+            "api_key": self.api_key,
+            "query": query,
+            "search_depth": search_depth,
+            "max_results": max_results,
+            "include_domains": list(include_domains) if include_domains else None,
+            "include_answer": False,
+            "include_raw_content": False,
+            "include_images": False
+        }
+        self.requests_sent += 1
+        response = self.session.post(self.base_url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def search(
+        self,
+        query: str,
+        max_results: int = 5,
+        search_depth: str = "basic",
+        include_domains: Optional[Iterable[str]] = None
+    ) -> dict:
+        """
+        Search, serving repeated queries from the cache.
+
+        Concurrent calls for the same search share one HTTP request.
+
+        Args:
+            query: Search query
+            max_results: Maximum number of results
+            search_depth: "basic" or "advanced"
+            include_domains: Restrict results to these domains
+
+        Returns:
+            Tavily response JSON (with a "results" list)
+        """
+        include_domains = list(include_domains) if include_domains else None
+        key = self.cache_key(query, include_domains, max_results, search_depth)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._post(query, include_domains, max_results, search_depth)
+            self.cache.set(key, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        """Return request, coalescing, rate-limit and cache counters."""
+        return {
+            "requests_sent": self.requests_sent,
+            "coalesced": self.coalesced,
+            "rate_limit_wait_s": round(self.limiter.waited_seconds, 3),
+            "cache": self.cache.stats()
+        }
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+
+_client: Optional[TavilySearchClient] = None
+_client_lock = threading.Lock()
+
+
+def get_tavily_client(api_key: str) -> TavilySearchClient:
+    """Get or create the shared Tavily client (recreated if the API key changes)."""
+    global _client
+    with _client_lock:
+        if _client is None or _client.api_key != api_key:
+            if _client is not None:
+                _client.close()
+            _client = TavilySearchClient(api_key)
+        return _client
@@ -3,11 +3,22 @@ Web Search Tool for Medical Information
 Uses Tavily API for real-time medical information retrieval
 """
 import os
+import sys
 from typing import Optional
 from dotenv import load_dotenv
 
+# Add project root to path so this module can also be run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.offline_search import get_offline_index
+from tools.tavily_client import get_tavily_client
+
 load_dotenv()
 
+TRUSTED_DOMAINS = ["mayoclinic.org", "kidney.org", "niddk.nih.gov", "ncbi.nlm.nih.gov"]
+
+OFFLINE_NOTE = "📚 Note: Results from the offline mirror of trusted medical pages (TAVILY_API_KEY not configured).\n"
+
 
 def web_search(query: str, max_results: int = 3) -> str:
     """
@@ -26,39 +37,42 @@ def web_search(query: str, max_results: int = 3) -> str:
         
         if tavily_key and tavily_key != "your-tavily-api-key-here":
             try:
-                from tavily import TavilyClient
-                
-                client = TavilyClient(api_key=tavily_key)
-                results = client.search(
+                results = get_tavily_client(tavily_key).search(
                     query=query,
                     max_results=max_results,
                     search_depth="advanced",
-                    include_domains=["mayoclinic.org", "kidney.org", "niddk.nih.gov", "ncbi.nlm.nih.gov"]
+                    include_domains=TRUSTED_DOMAINS
                 )
                 
                 if not results.get("results"):
                     return "⚠️ No search results found. Please rephrase your query."
                 
-                formatted_results = "🔍 **Web Search Results:**\n\n"
-                for i, result in enumerate(results["results"], 1):
-                    formatted_results += f"**{i}. {result['title']}**\n"
-                    formatted_results += f"   {result['content']}\n"
-                    formatted_results += f"   🔗 Source: {result['url']}\n\n"
+                return _format_results(results["results"])
                 
-                return formatted_results
-                
-            except ImportError:
-                pass  # results
             except Exception as e:
                 return f"⚠️ Web search temporarily unavailable: {str(e)}\nPlease rely on the knowledge base for now."
         
-    
+        # Local mirror of trusted pages, then canned results
+        offline_results = get_offline_index().search(query, max_results=max_results)["results"]
+        if offline_results:
+            return _format_results(offline_results) + OFFLINE_NOTE
+        
         return _get_mock_search_results(query)
         
     except Exception as e:
         return f"❌ Error performing web search: {str(e)}"
 
 
+def _format_results(results: list) -> str:
+    """Format search results (title, content, url) for the agent."""
+    formatted_results = "🔍 **Web Search Results:**\n\n"
+    for i, result in enumerate(results, 1):
+        formatted_results += f"**{i}. {result['title']}**\n"
+        formatted_results += f"   {result['content']}\n"
+        formatted_results += f"   🔗 Source: {result['url']}\n\n"
+    return formatted_results
+
+
 def _get_mock_search_results(query: str) -> str:
     """
     Provide mock search results when Tavily API is not available.
@@ -0,0 +1,96 @@
+"""
+BM25 Index
+In-memory inverted index with Okapi BM25 ranking
+"""
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be been before but by can could did do does
+for from had has have how i if in into is it its me my no not of on or our should so than that
+the their them then there these they this to up was we were what when where which while who
+why will with would you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents"""
+
+    def __init__(self, documents: Iterable[str], k1: float = 1.5, b: float = 0.75):
+        """
+        Build the index.
+
+        Args:
+            documents: Document texts; results refer to them by position
+            k1: Term-frequency saturation
+            b: Document-length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        lengths = array('I')
+
+        for doc_id, text in enumerate(documents):
+            counts = Counter(tokenize(text))
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array('I'), array('I'))
+                postings[0].append(doc_id)
+                postings[1].append(tf)
+
+        self.doc_count = len(lengths)
+        self.avg_length = (sum(lengths) / self.doc_count) if self.doc_count else 0.0
+        # Per-document length normalization term, precomputed
+        self._norms = [
+            k1 * (1 - b + b * length / self.avg_length) if self.avg_length else k1
+            for length in lengths
+        ]
+        self._idf = {
+            term: math.log(1 + (self.doc_count - len(ids) + 0.5) / (len(ids) + 0.5))
+            for term, (ids, _) in self._postings.items()
+        }
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """Return BM25 scores of all documents matching at least one query term."""
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            idf = self._idf[term]
+            k1 = self.k1
+            norms = self._norms
+            for doc_id, tf in zip(*postings):
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norms[doc_id])
+        return scores
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Rank documents for a query.
+
+        Args:
+            query: Query text
+            k: Number of results
+
+        Returns:
+            (document position, score) pairs, best first
+        """
+        scores = self.scores(query)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,146 @@
+"""
+Staged Startup
+Loads the knowledge base and the agents in background threads and reports where startup time goes
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from utils.logger import get_logger
+
+
+class StartupTimer:
+    """Records the duration of named startup stages, which may run in parallel"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._stages: List[dict] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as one stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self._stages.append({
+                    "stage": name,
+                    "thread": threading.current_thread().name,
+                    "start_s": round(start - self.started, 3),
+                    "duration_s": round(end - start, 3)
+                })
+
+    def stages(self) -> List[dict]:
+        """Return recorded stages in start order."""
+        with self._lock:
+            return sorted(self._stages, key=lambda stage: stage["start_s"])
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Return wall-clock and summed stage time.
+
+        Summed stage time above the wall-clock time is time saved by running
+        stages in parallel.
+        """
+        stages = self.stages()
+        wall = max((s["start_s"] + s["duration_s"] for s in stages), default=0.0)
+        busy = sum(s["duration_s"] for s in stages)
+        return {"wall_s": round(wall, 3), "stage_total_s": round(busy, 3), "parallel_saved_s": round(max(busy - wall, 0.0), 3)}
+
+    def report(self) -> str:
+        """Format the stages as a table."""
+        lines = [f"{'stage':<22} {'thread':<12} {'start s':>8} {'took s':>8}"]
+        for s in self.stages():
+            lines.append(f"{s['stage']:<22} {s['thread']:<12} {s['start_s']:>8.3f} {s['duration_s']:>8.3f}")
+        summary = self.summary()
+        lines.append(
+            f"ready after {summary['wall_s']:.3f} s "
+            f"({summary['stage_total_s']:.3f} s of work, {summary['parallel_saved_s']:.3f} s saved in parallel)"
+        )
+        return "\n".join(lines)
+
+
+class SystemLoader:
+    """Builds the knowledge base and the agents in parallel, off the UI thread"""
+
+    def __init__(self, timer: Optional[StartupTimer] = None):
+        """
+        Initialize the loader (call start() to begin loading).
+
+        Args:
+            timer: Timer recording the startup stages
+        """
+        self.timer = timer or StartupTimer()
+        self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="startup")
+        self._rag_future: Optional[Future] = None
+        self._crew_future: Optional[Future] = None
+        self._system_future: Optional[Future] = None
+
+    def start(self) -> "SystemLoader":
+        """Start loading in the background; returns immediately."""
+        self._rag_future = self._executor.submit(self._load_knowledge_base)
+        self._crew_future = self._executor.submit(self._load_crew)
+        self._system_future = self._executor.submit(self._attach)
+        self._executor.shutdown(wait=False)
+        return self
+
+    def _load_knowledge_base(self):
+        """Import the RAG stack, open the vector store and warm the embedding model."""
+        with self.timer.stage("import rag"):
+            from rag.loader import setup_rag_system
+
+        with self.timer.stage("knowledge base"):
+            rag = setup_rag_system()
+            retriever = rag.get_retriever(k=3)
+
+        # The first forward pass allocates buffers; keep it off the first user query
+        with self.timer.stage("embedding warmup"):
+            rag.embeddings.underlying.embed_query("warmup")
+            if rag.reranker is not None:
+                rag.reranker.model
+        return retriever
+
+    def _load_crew(self):
+        """Import CrewAI and build the agents and their crews."""
+        with self.timer.stage("import agents"):
+            from agents.crew import create_medical_crew
+
+        with self.timer.stage("agents"):
+            return create_medical_crew()
+
+    def _attach(self):
+        """Give the crew its knowledge base once both are loaded."""
+        crew = self._crew_future.result()
+        retriever = self._rag_future.result()
+        with self.timer.stage("attach"):
+            crew.attach_knowledge_base(retriever)
+        get_logger().log_system_event(
+            "System initialization complete",
+            {**self.timer.summary(), "stages": self.timer.stages()}
+        )
+        return crew
+
+    @property
+    def ready(self) -> bool:
+        """Whether loading has finished (successfully or not)."""
+        return self._system_future is not None and self._system_future.done()
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Wait for the system to load.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            The MedicalAICrew with its knowledge base attached
+
+        Raises:
+            The exception raised while loading, if any
+        """
+        return self._system_future.result(timeout=timeout)
@@ -0,0 +1,138 @@
+"""
+Token Counting
+Heuristic token estimates and optional tokenizer-backed counters for prompt budgeting
+"""
+import math
+import os
+import re
+import threading
+
+
+TOKEN_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Subword tokenizers average about four characters of English text per token
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARK = "…"
+
+# Hugging Face tokenizer used to count prompt tokens ("" uses the heuristic estimate)
+PROMPT_TOKENIZER = os.getenv("PROMPT_TOKENIZER", "")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Takes the larger of the word/punctuation count and characters / 4, so
+    both short-word prose and long medical terms (which split into several
+    subword tokens) are counted conservatively.
+    """
+    if not text:
+        return 0
+    return max(len(TOKEN_PIECE_PATTERN.findall(text)), math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut a text to at most about max_tokens tokens, at a word boundary.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+
+    Returns:
+        The text unchanged if it fits, otherwise its longest fitting prefix
+        followed by an ellipsis
+    """
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Shrink proportionally until the prefix fits
+    end = len(text)
+    while end > 0:
+        end = int(end * max_tokens / max(estimate_tokens(text[:end] + TRUNCATION_MARK), 1) * 0.95)
+        space = text.rfind(" ", 0, end)
+        prefix = text[:space if space > 0 else end].rstrip()
+        if estimate_tokens(prefix + TRUNCATION_MARK) <= max_tokens:
+            return prefix + TRUNCATION_MARK if prefix else ""
+        end = len(prefix)
+    return ""
+
+
+class TokenCounter:
+    """Heuristic token counter; subclasses count with a real tokenizer"""
+
+    name = "heuristic"
+
+    def count(self, text: str) -> int:
+        """Return the number of tokens in a text."""
+        return estimate_tokens(text)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut a text to at most max_tokens tokens."""
+        return truncate_to_tokens(text, max_tokens)
+
+
+class TokenizerCounter(TokenCounter):
+    """Exact counts from a Hugging Face tokenizer, loaded on first use"""
+
+    def __init__(self, tokenizer_name: str):
+        """
+        Initialize the counter (the tokenizer is loaded on first use).
+
+        Args:
+            tokenizer_name: Hugging Face tokenizer name or local path
+        """
+        self.name = tokenizer_name
+        self._tokenizer = None
+        self._lock = threading.Lock()
+
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            with self._lock:
+                if self._tokenizer is None:
+                    from transformers import AutoTokenizer
+
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.name)
+        return self._tokenizer
+
+    def count(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False)) if text else 0
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        encoding = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        offsets = encoding["offset_mapping"]
+        if len(offsets) <= max_tokens:
+            return text
+        # Leave one token for the truncation mark and end at a word boundary
+        end = offsets[max(max_tokens - 1, 0)][0]
+        space = text.rfind(" ", 0, end)
+        prefix = text[:space if space > 0 else end].rstrip()
+        return prefix + TRUNCATION_MARK if prefix else ""
+
+
+_counters = {}
+_counters_lock = threading.Lock()
+
+
+def get_token_counter(tokenizer_name: str = PROMPT_TOKENIZER) -> TokenCounter:
+    """
+    Get the shared token counter for a tokenizer.
+
+    Args:
+        tokenizer_name: Hugging Face tokenizer name or path ("" for the heuristic)
+
+    Returns:
+        A TokenCounter
+    """
+    with _counters_lock:
+        counter = _counters.get(tokenizer_name)
+        if counter is None:
+            counter = TokenizerCounter(tokenizer_name) if tokenizer_name else TokenCounter()
+            _counters[tokenizer_name] = counter
+        return counter